@@ -3,6 +3,7 @@ description = ("count depth increases",
                "count depth increases for three line sliding windows",          # part 2
               )
 
+from collections import deque
 
 # to run:
 #   put advent_puzzle.py and advent.py into a folder
@@ -19,57 +20,104 @@ def puzzle_part1(lines):
     """run  part1 of puzzle"""
     
     # count increases in depth for each line (window_size=1)
-    increase_count = count_depth_increases(lines, window_size=1)
+    # (lines is a stream of the input file, NumPy can load the file itself)
+    increase_count = count_depth_increases(lines, window_size=1, input_file=advent.input_file_name())
     
     print(f"\ndepth increased {increase_count} times\n")
+    return increase_count
 
 
 def puzzle_part2(lines):
     """run part2 of puzzle"""
     
     # count increases in depth for each window of size 3
-    increase_count = count_depth_increases(lines, window_size=3)
+    increase_count = count_depth_increases(lines, window_size=3, input_file=advent.input_file_name())
     
     print(f"\ndepth increased {increase_count} times\n")
+    return increase_count
+
 
+def count_depth_increases(lines, window_size, input_file=None):
+    """count depth increases for a window_size window (or for several window sizes)
+         window_size can be a single size, or a list of sizes which are all counted
+         in the same pass over the depths (a dictionary of counts by size is returned)
+         input_file is the file the lines are streamed from, if they are (the NumPy
+         code reads it directly instead of the lines)
+    """
+    
+    # the lines (a stream or a list) are converted to integers as they are used
+    # (int() also accepts depths that are already integers)
+    depths = map(prepare_line, lines)
+    
+    window_sizes = (window_size,) if isinstance(window_size, int) else window_size
+    if advent.use_numpy():
+        counts = count_increases_numpy(depths, window_sizes, input_file)
+    else:
+        counts = count_increases(depths, window_sizes)
+    if isinstance(window_size, int):
+        return counts[window_size]
+    return counts
 
-def depth_windows(depths, window_size):
-    """generater for windows over depths"""
-    next_window_start = 0
-    last_window_start = len(depths) - window_size
-    while next_window_start <= last_window_start:
-        yield depths[next_window_start:next_window_start+window_size]
-        next_window_start += 1
 
-def count_depth_increases(lines, window_size):
-    """count depth increases for a window_size window"""
+def count_increases(depths, window_sizes):
+    """count the depth increases for each of the window sizes, in one pass over the depths
+         the windows ending at depth i and at depth i-1 share all but two depths, so
+         the sum of a window is greater than the sum of the previous window exactly when
+         depths[i] > depths[i-window_size].  No sums are computed, and only the last
+         max(window_sizes) depths are kept (depths can be any iterable)
+    """
+    window_sizes = sorted(set(window_sizes))
+    if not window_sizes or window_sizes[0] < 1:
+        raise ValueError(f"window sizes must be at least 1, not {window_sizes}")
     
-    # convert list of strings to a list of integers
-    depths = prepare_input_list(lines)
+    # number of times depth increased in windows of each size
+    counts = [0] * len(window_sizes)
     
-    # number of times depth increased in windows of size 'window_size'
-    increase_count = 0
+    # the most recent depths, history[-w] is the depth w lines before the current one
+    # (the first window of each size doesn't count towards its count, there is nothing
+    # w lines before its first depth)
+    history = deque(maxlen=window_sizes[-1])
+    for depth in depths:
+        available = len(history)
+        for n, window_size in enumerate(window_sizes):
+            if window_size > available:
+                break
+            if depth > history[-window_size]:
+                counts[n] += 1
+        history.append(depth)
     
-    # first window doesn't count towards increase_count, so
-    # make sure it doesn't look like an increase
-    previous_sum = None
-    # for each window, sum the depths and add to 'increase_count' if the sum is greater than previous
-    for window in depth_windows(depths, window_size):
-        current_sum = sum(window)
-        if previous_sum and current_sum > previous_sum:
-            increase_count += 1
-        previous_sum = current_sum
-            
-    return increase_count
+    return dict(zip(window_sizes, counts))
+
+
+def count_increases_numpy(depths, window_sizes, input_file=None):
+    """count the depth increases for each of the window sizes with NumPy array operations
+         the depths are loaded into an int32 array (straight from input_file if the
+         depths are streamed from it, the streamed lines are not read), then for each
+         window size the count is the number of depths greater than the depth
+         window_size before it
+    """
+    np = advent.np
+    window_sizes = sorted(set(window_sizes))
+    if not window_sizes or window_sizes[0] < 1:
+        raise ValueError(f"window sizes must be at least 1, not {window_sizes}")
+    
+    if input_file is not None:
+        # parse the whole file in C, one depth per line
+        depths = np.fromfile(input_file, dtype=np.int32, sep='\n')
+    else:
+        depths = np.fromiter(depths, dtype=np.int32)
+    
+    return {window_size: int(np.count_nonzero(depths[window_size:] > depths[:-window_size]))
+            for window_size in window_sizes}
 
 
-def prepare_input_list(lines):
-    """convert the lines to integers"""
+def prepare_line(line):
+    """convert a line to an integer (applied to each line as it is used)"""
     
-    return [int(line) for line in lines]
+    return int(line)
 
 # import code common for all Advent puzzles
 import advent 
 # pass module name, and package
-advent.startup(__name__, __package__, )
+advent.startup(__name__, __package__, stream=True)
 
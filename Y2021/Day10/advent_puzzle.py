@@ -23,7 +23,7 @@ class AdventPuzzle():
         self.closings = {'(':')', '[':']', '{':'}', '<':'>'}
         self.illegal_scores = {')': 3, ']': 57, '}': 1197, '>': 25137}
         self.complete_points = {')': 1, ']': 2, '}': 3, '>': 4}
-        self.print_lines = True if len(lines) < 20 else False
+        self.print_lines = True if len(lines) < 20 and advent.showing() else False
 
 
     def puzzle_part1(self):
@@ -35,6 +35,7 @@ class AdventPuzzle():
             syntax_error_score += self.score_corrupt_line(line, line_no)
             
         print(f"Syntax Error Score {syntax_error_score}")
+        return syntax_error_score
     
     
     def puzzle_part2(self):
@@ -51,6 +52,7 @@ class AdventPuzzle():
         median = int(len(autocomplete_points)/2)
         
         print(f"median index={median}, median value={autocomplete_points[median]}")
+        return autocomplete_points[median]
         
     def prepare_input_list(self, lines):
         """create a list of the input"""
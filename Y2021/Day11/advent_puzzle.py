@@ -13,6 +13,8 @@ description = (("Flashing Octopus automaton", "Count the total flashes in 100 st
 #   them up to be able to be executed in a batch with more puzzles.  You can ignore
 #   that.  
 
+import grid
+
 
 class AdventPuzzle():
     def __init__(self, lines):
@@ -30,10 +32,11 @@ class AdventPuzzle():
         for i in range(steps):
             
             total_flashes += self.step_grid()
-            if (i+1) % 10 == 0:
+            if (i+1) % 10 == 0 and advent.showing():
                 self.print_grid(f"After Step {i+1}")
             
         print(f"Total flashes = {total_flashes}")
+        return total_flashes
     
     
     def puzzle_part2(self):
@@ -47,17 +50,27 @@ class AdventPuzzle():
             
             flashes = self.step_grid()
             total_flashes += flashes
-            if flashes == 100:
-                self.print_grid(f"After Step {i+1} with {flashes} flashes")
+            if flashes == len(self.octopuses):
+                if advent.showing():
+                    self.print_grid(f"After Step {i+1} with {flashes} flashes")
                 break
-            if (i+1) % 10 == 0:
+            if (i+1) % 10 == 0 and advent.showing():
                 self.print_grid(f"After Step {i+1} with {flashes} flashes")
+        else:
+            # there is no answer if the octopuses never all flashed at once
+            print(f"the octopuses did not all flash at once in {steps} steps")
+            return None
             
         print(f"Total flashes = {total_flashes}")
+        advent.diagnostic('total flashes', total_flashes)
+        # the answer is the first step on which all of the octopuses flashed
+        return i+1
 
 
     def step_grid(self):
         """perform one step on the grid"""
+        if advent.use_numpy():
+            return self.step_grid_numpy()
         
         # first increment the energy levels of each octopus
         self.step_part1()
@@ -79,37 +92,26 @@ class AdventPuzzle():
         
         
     def octopus_grid(self):
-        """generate x, y, and val for each octopus in the grid"""
-        for y, row in enumerate(self.grid):
-            for x, val in enumerate(row):
-                yield x, y, val
+        """generate the flat index and val for each octopus in the grid"""
+        cells = self.grid.cells
+        for i in self.octopuses:
+            yield i, cells[i]
                 
                 
-    neighbors_set = ((-1,-1),(0,-1),(1,-1),(-1,0),(1,0),(-1,1),(0,1),(1,1))
-
-    def neighbors(self, x, y):
-        """generate coordinates for neighbors of octopus at x,y """
-        
-        for dx, dy in AdventPuzzle.neighbors_set:
-            # compute x, y coordinates of each of the eight neighbors
-            xp, yp = x+dx, y+dy
-            # if the neighbor is within the grid return its coordinates
-            if 0 <= xp < 10 and 0 <= yp < 10:
-                yield xp, yp
-                
-        
     def step_part1(self):
         """increase each octopus by 1"""
-        for x, y, val in self.octopus_grid():
-            self.grid[y][x] = val + 1
+        cells = self.grid.cells
+        for i in self.octopuses:
+            cells[i] += 1
         
         
     def step_part2(self):
         """find octopuses with energy greater than 9, and set them to -1 (which indicates about to flash)"""
+        cells = self.grid.cells
         flashes = 0
-        for x, y, val in self.octopus_grid():
+        for i, val in self.octopus_grid():
             if val > 9:
-                self.grid[y][x] = -1
+                cells[i] = -1
                 flashes += 1
         return flashes
         
@@ -117,21 +119,49 @@ class AdventPuzzle():
         
     def step_part3(self):
         """find any octopus with energy = -1 (about to flash), set it to 0 (flashed) and increase its neighbors by 1"""
-        for x, y, val in self.octopus_grid():
+        cells = self.grid.cells
+        for i, val in self.octopus_grid():
             if val == -1:
                 # set the energy of the octopus that just flashed to 0
-                self.grid[y][x] = 0
-                for xp, yp in self.neighbors(x, y):
+                cells[i] = 0
+                for delta in self.neighbors:
                     # do not increase neighbor if it's energy is zero (just flashed) or -1 (about to flash)
-                    if self.grid[yp][xp] > 0:
-                        self.grid[yp][xp] += 1
+                    # (the border is always zero, so it is never increased)
+                    if cells[i+delta] > 0:
+                        cells[i+delta] += 1
+
+
+    def step_grid_numpy(self):
+        """perform one step on the grid with NumPy array operations"""
+        np = advent.np
+        # a view of the grid's cells, the grid is updated in place
+        energy = self.grid.to_numpy()
+        
+        # first increment the energy levels of each octopus
+        energy += 1
+        
+        # each wave of flashes increases the energy of the neighbors of the octopuses
+        # that flashed in it, until a wave has no new flashes (each octopus flashes once)
+        flashed = np.zeros(energy.shape, dtype=bool)
+        while True:
+            flashing = (energy > 9) & ~flashed
+            if not flashing.any():
+                break
+            flashed |= flashing
+            energy += grid.neighbor_sum(flashing).astype(energy.dtype)
+        
+        # the octopuses that flashed are reset to 0
+        energy[flashed] = 0
+        return int(flashed.sum())
 
 
     def print_grid(self, title=None):
         """print the grid, highlighting any octopuses that just flashed (energy=0)"""
+        if not advent.showing():
+            return
         if title:
             print(title)
-        for row in self.grid:
+        for row in self.grid.rows():
             for val in row:
                 if val == 0:
                     bright = advent.BRIGHT
@@ -143,8 +173,15 @@ class AdventPuzzle():
                         
         
     def prepare_input_list(self, lines):
-        """create a list of the input"""
-        return [[int(v) for v in line] for line in lines]
+        """create a grid of the input
+             the grid has a border of 0's (which look like octopuses that have just flashed,
+             so they are never increased) so the neighbors never need to be bounds checked
+        """
+        octopus_grid = grid.Grid.from_rows([[int(v) for v in line] for line in lines], pad=1, border=0)
+        # flat indices of the octopuses, and the offsets to their eight neighbors
+        self.octopuses = octopus_grid.interior()
+        self.neighbors = octopus_grid.offsets(grid.ALL)
+        return octopus_grid
     
 # import code common for all Advent puzzles
 import advent 
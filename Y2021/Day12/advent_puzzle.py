@@ -24,6 +24,8 @@ class AdventPuzzle():
 
     def puzzle_part1(self):
         """run  part1 of puzzle"""
+        self.print_cave_map()
+        
         # paths from start to end will be added to self.paths
         self.paths = []
         
@@ -37,11 +39,13 @@ class AdventPuzzle():
         print()
         
         # for small sample data, print the paths found
-        if len(self.paths) < 30:
+        if len(self.paths) < 30 and advent.showing():
             for path in self.paths:
                 AdventPuzzle.print_caves(path)
                 print()
             print()
+        
+        return self.part1_count
             
             
     def puzzle_part2(self):
@@ -71,6 +75,7 @@ class AdventPuzzle():
             total_count += count
             
         print(f"\n{total_count:6d} total paths found")
+        return total_count
         
         
     # def follow_path(self, from_cave, path_so_far, small_cave_twice=None, small_cave_used_twice=False):
@@ -127,14 +132,17 @@ class AdventPuzzle():
                         caves[a].append(b)
                     else:
                         caves[a]= [b]
-        
-        print(f"\nInput caves and connections\n")
-        for cave, connections in caves.items():
-            print(f"cave: {cave:5s}  - ", end='')    
-            AdventPuzzle.print_caves(connections)
-            print()
-        print()    
         return caves
+    
+    def print_cave_map(self):
+        """print the caves and their connections"""
+        if advent.showing():
+            print(f"\nInput caves and connections\n")
+            for cave, connections in self.caves.items():
+                print(f"cave: {cave:5s}  - ", end='')    
+                AdventPuzzle.print_caves(connections)
+                print()
+            print()    
         
     
 # import code common for all Advent puzzles
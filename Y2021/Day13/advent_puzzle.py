@@ -15,6 +15,8 @@ description = (("Interpret the user manual by folding",             # part 1
 #   them up to be able to be executed in a batch with more puzzles.  You can ignore
 #   that.  
 
+import grid
+
 
 class AdventPuzzle():
     def __init__(self, lines):
@@ -33,7 +35,9 @@ class AdventPuzzle():
         else:
             self.fold_vertical(index)
         
-        print(f"dot count after 1 fold = {self.count_dots()}")
+        dot_count = self.count_dots()
+        print(f"dot count after 1 fold = {dot_count}")
+        return dot_count
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
@@ -47,58 +51,61 @@ class AdventPuzzle():
                 
         # print the grid so we can see the code
         self.print()
-
-    def merge_grid(self, fold_grid):
-        """merge the folded and the base parts of the grid)"""
-        for y in range(len(self.grid)):
-            for x in range(len(self.grid[0])):
-                if self.grid[y][x] == '.':
-                    self.grid[y][x] = fold_grid[y][x]
         
+        # the answer is the code, return the grid as text
+        return '\n'.join(self.grid.to_lines('.#'))
 
     def fold_horizontal(self, y_fold):
         """fold the grid on a horizontal axis"""
-        # create the folded part of the grid
-        fold_grid = self.grid[y_fold*2:y_fold:-1]
-        # base grid is reduced to half
-        self.grid = self.grid[0:y_fold:]
+        if advent.use_numpy():
+            dots = self.grid.to_numpy()
+            return self.fold_numpy(dots[:y_fold] | dots[y_fold*2:y_fold:-1])
         
-        # merge the folded and base grids
-        self.merge_grid(fold_grid)
+        # base grid is reduced to half, the folded part (below the fold) is merged into it
+        folded = grid.Grid(self.grid.width, y_fold, typecode='B')
+        for y in range(y_fold):
+            base = self.grid.index(0, y)
+            fold = self.grid.index(0, y_fold*2 - y)
+            start = folded.index(0, y)
+            for x in range(folded.width):
+                folded.cells[start+x] = self.grid.cells[base+x] | self.grid.cells[fold+x]
+        self.grid = folded
     
     def fold_vertical(self, x_fold):
         """fold the grid on a vertical axis"""
-        # create the folded part of the grid
-        fold_grid = [row[x_fold*2:x_fold:-1] for row in self.grid]
-        # base grid is reduced to half
-        self.grid = [row[:x_fold] for row in self.grid]
-            
-        # merge the folded and base grids    
-        self.merge_grid(fold_grid)    
+        if advent.use_numpy():
+            dots = self.grid.to_numpy()
+            return self.fold_numpy(dots[:, :x_fold] | dots[:, x_fold*2:x_fold:-1])
+        
+        # base grid is reduced to half, the folded part (right of the fold) is merged into it
+        folded = grid.Grid(x_fold, self.grid.height, typecode='B')
+        for y in range(folded.height):
+            row = self.grid.index(0, y)
+            start = folded.index(0, y)
+            for x in range(x_fold):
+                folded.cells[start+x] = self.grid.cells[row+x] | self.grid.cells[row + x_fold*2 - x]
+        self.grid = folded
+        
+    def fold_numpy(self, folded):
+        """replace the grid with the (NumPy array) result of a fold"""
+        self.grid = grid.Grid(folded.shape[1], folded.shape[0], typecode='B')
+        self.grid.to_numpy()[:] = folded
         
     def count_dots(self):
         """count the number of 'dots' """
-        dot_count = 0
-        for row in self.grid:
-            for point in row:
-                if point == '#':
-                    dot_count += 1
-        return dot_count
+        return self.grid.count(1)
         
     def print(self):
         """if small, print the grid, otherwise just print its size"""
-        if len(self.grid) > 50:
-            print(f"grid size is {len(self.grid[0])},{len(self.grid)}")
+        if not advent.showing():
+            return
+        if self.grid.height > 50:
+            print(f"grid size is {self.grid.width},{self.grid.height}")
         else:
-            for row in self.grid:
-                for point in row:
-                    # to make the code more readable
-                    # change the '.' into a space
-                    if point == '.': point = ' '
-                    # change the '#' into a filled block
-                    if point == '#': point = '\u2586'
-                    print(f"{point}", end='') 
-                print()
+            # to make the code more readable
+            # print the '.' as a space and the '#' as a filled block
+            for line in self.grid.to_lines(' \u2586'):
+                print(line)
         print()
         
     def prepare_input_list(self, lines):
@@ -135,9 +142,10 @@ class AdventPuzzle():
         self.x_size = max(max_x, max_index_x * 2) + 1
         self.y_size = max(max_y, max_index_y * 2) + 1
         
-        self.grid = [['.' for x in range(self.x_size)] for y in range(self.y_size)]
+        # the grid has 1 where there is a dot, otherwise 0
+        self.grid = grid.Grid(self.x_size, self.y_size, typecode='B')
         for x,y in self.points:
-            self.grid[y][x] = '#'
+            self.grid[x,y] = 1
             
         
         
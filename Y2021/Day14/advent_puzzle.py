@@ -79,7 +79,7 @@ class AdventPuzzle():
                     
         print(f"after 10 steps")
         
-        self.print_results(self.part1_element_count)
+        return self.print_results(self.part1_element_count)
 
 
     def part1_element_count(self, element):
@@ -118,7 +118,7 @@ class AdventPuzzle():
             
         print(f"after {steps} steps:")
         
-        self.print_results(self.part2_element_count)
+        return self.print_results(self.part2_element_count)
             
 
     def part2_element_count(self, element):
@@ -137,7 +137,9 @@ class AdventPuzzle():
     
 
     def print_results(self, element_count):
-        """print the results using the appropriate function (supplied as a parameter) to count the elements"""
+        """print the results using the appropriate function (supplied as a parameter) to count the elements
+           return the difference between the maximum and minimum counts
+        """
         max_count = 0
         min_count = None
         print(f" element counts:")
@@ -153,6 +155,7 @@ class AdventPuzzle():
         print(f"maximum count = {max_count:18,d}")
         print(f"minimum count = {min_count:18,d}")
         print(f"difference    = {max_count - min_count:18,d}")        
+        return max_count - min_count
 
 
 
@@ -6,6 +6,7 @@ description = (("Find the optimal path through the cave, with the least risk",
               )
               
 import TimingManager as tm
+import grid
 # to run:
 #   put advent_puzzle.py and advent.py into a folder
 #   navigate to that folder
@@ -27,7 +28,7 @@ class AdventPuzzle():
         """run  part1 of puzzle"""
         
         # Use Dijkstra's algorithm to find the shortest path
-        self.dijkstra(source=(0,0), target=(self.size_x-1, self.size_y-1))
+        return self.dijkstra(source=(0,0), target=(self.size_x-1, self.size_y-1))
         
 
     def puzzle_part2(self):
@@ -35,50 +36,35 @@ class AdventPuzzle():
         
         # expand the input to be 5 times bigger in each direction
         # the risk values for the expanded sections are derived from the original input file
-        new_tile_risks = []
-        for row in self.risks:
-            new_row = list(row)
-            prev_tile_row = list(row)
-            for n in range(4):
-                next_tile_row = []
-                for v in prev_tile_row:
-                    v += 1
-                    if v > 9:
-                        v = 1
-                    next_tile_row.append(v)
-                    new_row.append(v)
-                prev_tile_row = next_tile_row
-            new_tile_risks.append(new_row)
-        
-        new_risks = list(new_tile_risks)
-        next_risks = list(new_tile_risks)
-        for n in range(4):
-            prev_risks = next_risks
-            next_risks = []
-            for row in prev_risks:
-                next_tile_row = []
-                for v in row:
-                    v += 1
-                    if v > 9:
-                        v = 1
-                    next_tile_row.append(v)
-                new_risks.append(next_tile_row)
-                next_risks.append(next_tile_row)
-        
-        self.risks = new_risks
-        self.size_x = len(new_risks[0])
-        self.size_y = len(new_risks)
+        # each tile to the right or down adds 1 to the risk, wrapping from 9 back to 1
+        rows = self.risks.rows()
+        new_risks = []
+        for tile_y in range(5):
+            for row in rows:
+                new_row = []
+                for tile_x in range(5):
+                    new_row.extend((v + tile_x + tile_y - 1) % 9 + 1 for v in row)
+                new_risks.append(new_row)
+        
+        self.risks = self.make_grid(new_risks)
+        self.size_x = self.risks.width
+        self.size_y = self.risks.height
         
         # compute the shortest path from source to target using Djikstra's algorithm
-        self.dijkstra(source=(0,0), target=(self.size_x-1, self.size_y-1))             
+        return self.dijkstra(source=(0,0), target=(self.size_x-1, self.size_y-1))             
         
 
     def dijkstra(self, source, target):
-        """use Djikstra's algorithm to find the shortest path"""
+        """use Djikstra's algorithm to find the shortest path, return its total risk"""
+        risks = self.risks.cells
+        neighbors = self.risks.offsets(grid.ORTHOGONAL)
+        source = self.risks.index(*source)
+        target = self.risks.index(*target)
                 
-        # unvisited is a dictionary keyed by x,y location,
-        # which contains the best path found so far from source to location x,y
-        unvisited = {node: 99999999 for node in [(x,y) for x in range(self.size_x) for y in range(self.size_y)]}        
+        # unvisited is a grid (the same shape as the risks)
+        # which contains the best path found so far from source to each location
+        # its border is -1, so a path to a location outside the grid is never better
+        unvisited = grid.Grid(self.size_x, self.size_y, fill=99999999, pad=1, border=-1, typecode='l').cells
         
         # have distance is like unvisited but contains only the subset of locations that are
         # candidates to be considered for the next iteration
@@ -94,12 +80,13 @@ class AdventPuzzle():
         unvisited[source] = current_distance
         
         # Djikstra's algorithn for shortest path
-        with tm.TimingManager('Dijkstra algorithm', elapsedOnly=True):
+        with tm.TimingManager('Dijkstra algorithm', elapsedOnly=True, report=advent.showing()):
             while True:
                 # current is the unvisited node that is closest to the source
-                for neighbor, distance in self.neighbor_distances(current):   # 2,3 or 4 neighbors
+                for delta in neighbors:   # 4 neighbors (those outside the grid are never updated)
+                    neighbor = current + delta
                     # new_distance is distance from the source to this neighbor on this path
-                    new_distance = current_distance + distance
+                    new_distance = current_distance + risks[neighbor]
                     # if the neighbor has no distance from the source yet or the new distance is less than previous best path
                     if new_distance < unvisited[neighbor]:
                         # update this neighbor with the new distance
@@ -134,11 +121,8 @@ class AdventPuzzle():
             total_risk = 0
             total_steps = 0
             for node in path:
-                node_x = node[0]
-                node_y = node[1]
                 if node != source:
-                    risk = self.risks[node_y][node_x]
-                    total_risk += risk
+                    total_risk += risks[node]
                     total_steps += 1
                     
             # print the path (if the grid is not too big)
@@ -146,20 +130,15 @@ class AdventPuzzle():
         
         print(f"total steps={total_steps}")    
         print(f"total risk={total_risk}")
-
-
-    def neighbor_distances(self,loc):
-        """iterate over neighbors and their distances"""
-        x,y = loc
-        for xp, yp in self.neighbors(x,y):
-            yield (xp,yp), self.risks[yp][xp]
+        return total_risk
 
 
     def print_path(self, path):
         """print the grid with the path if it isn't too big"""
-        if self.size_x > 100:
+        if self.size_x > 100 or not advent.showing():
             return
-        for y, row in enumerate(self.risks):
+        path = set(self.risks.xy(node) for node in path)
+        for y, row in enumerate(self.risks.rows()):
             for x, c in enumerate(row):
                 if (x,y) in path:
                     bright = advent.BRIGHT
@@ -182,27 +161,18 @@ class AdventPuzzle():
         return path
     
     
-    def neighbors(self, x, y):
-        """generate coordinates for neighbors of location x,y """
-        
-        neighbors_set = ((0,-1),(-1,0),(1,0),(0,1))
-        
-        for dx, dy in neighbors_set:
-            # compute x, y coordinates of each of the four neighbors
-            xp, yp = x+dx, y+dy
-            # if the neighbor is within the grid return its coordinates
-            if 0 <= xp < self.size_x and 0 <= yp < self.size_y:
-                yield xp, yp
-        
-        
     def prepare_input_list(self, lines):
-        """create a list of the input"""
+        """create a grid of the input"""
         self.size_y = len(lines)
         self.size_x = len(lines[0])
         
-        risks = [[int(v) for v in line] for line in lines]
-        
-        return risks
+        return self.make_grid([[int(v) for v in line] for line in lines])
+
+
+    @staticmethod
+    def make_grid(risks):
+        """create a grid of risks, with a border (the dijkstra distances border stops paths leaving the grid)"""
+        return grid.Grid.from_rows(risks, pad=1)
         
     
 # import code common for all Advent puzzles
@@ -23,24 +23,41 @@ class AdventPuzzle():
     def __init__(self, lines):
         """initialize the AdventPuzzle object"""
         self.lines = self.prepare_input_list(lines)
+        # the transmission is decoded by the first part that runs (see decode)
+        self.base_packets = None
+        
+    def decode(self):
+        """parse the transmission into packets (only once, both parts use them)"""
+        if self.base_packets is not None:
+            return
         bitstrings = [Bits(convert_to_binary(packet_string)) for  packet_string in self.lines]
         
         self.base_packets = [Packet(bits) for bits in bitstrings]
         
-        print()
-        for packet in self.base_packets:
-            print(packet, '\n')
+        if advent.showing():
+            print()
+            for packet in self.base_packets:
+                print(packet, '\n')
         
     def puzzle_part1(self):
         """run  part1 of puzzle"""
+        self.decode()
         for packet in self.base_packets:
             print(f"version sum={packet.version_sum}")
+        return self.answer([packet.version_sum for packet in self.base_packets])
        
 
     def puzzle_part2(self):
         """run part2 of puzzle"""
+        self.decode()
         for packet in self.base_packets:
             print(f"packet value={packet.value}")
+        return self.answer([packet.value for packet in self.base_packets])
+    
+    @staticmethod
+    def answer(values):
+        """the answer is the value for the single transmission (samples may have several)"""
+        return values[0] if len(values) == 1 else values
         
         
     def prepare_input_list(self, lines):
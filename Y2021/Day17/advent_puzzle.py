@@ -57,8 +57,10 @@ class AdventPuzzle():
         overall_max_height = 0
         max_start_vy = 0
         min_start_vy = None
+        show = advent.showing()
         for start_vx in range(self.min_x_velocity, self.max_x_lob_velocity+1):
-            print(f"x velocity = {start_vx:3d}", end='')
+            if show:
+                print(f"x velocity = {start_vx:3d}", end='')
             self.max_steps_used = 0
             total_paths = 0
             for start_vy in range(0,200):
@@ -77,7 +79,8 @@ class AdventPuzzle():
                         max_start_vy = start_vy
                     if min_start_vy is None:
                         min_start_vy = start_vy
-            print(f"   max steps used {self.max_steps_used:5d},  paths {total_paths}")
+            if show:
+                print(f"   max steps used {self.max_steps_used:5d},  paths {total_paths}")
             if self.max_steps_used > overall_max_steps_used:
                 overall_max_steps_used = self.max_steps_used   
                     
@@ -86,6 +89,7 @@ class AdventPuzzle():
         print(f"max y velocity {max_start_vy}")
         self.part1_max_steps_used = overall_max_steps_used
         self.part1_max_y_velocity = max_start_vy
+        return overall_max_height
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
@@ -96,8 +100,10 @@ class AdventPuzzle():
         print()
         self.overall_max_steps_used = 0
         overall_total_paths = 0
+        show = advent.showing()
         for start_vx in range(self.min_x_velocity, self.max_x_flat_velocity+1):
-            print(f"x velocity = {start_vx:3d}", end='')
+            if show:
+                print(f"x velocity = {start_vx:3d}", end='')
             self.max_steps_used = 0
             total_paths = 0
             for start_vy in range(self.max_y_flat_velocity, self.part1_max_y_velocity+1):
@@ -108,11 +114,13 @@ class AdventPuzzle():
                     # this trajectory hit the target, count it
                     total_paths += 1
                     overall_total_paths += 1
-            print(f"   max steps used {self.max_steps_used:5d},  paths {total_paths}")   
+            if show:
+                print(f"   max steps used {self.max_steps_used:5d},  paths {total_paths}")   
             if self.max_steps_used > self.overall_max_steps_used:
                 self.overall_max_steps_used = self.max_steps_used
              
         print(f"total paths {overall_total_paths}")
+        return overall_total_paths
         
     def try_shot(self, start_vx, start_vy, steps=None):
         """simulate a launch with initial conditions"""
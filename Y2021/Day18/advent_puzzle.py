@@ -42,6 +42,7 @@ class AdventPuzzle():
         # compute the 'magnitude' of the sum    
         mag = self.magnitude((result,0), 0)
         print(f" magnitude = {mag}")
+        return mag
         
     
     def puzzle_part2(self):
@@ -65,6 +66,7 @@ class AdventPuzzle():
         print(f"  {biggest_left}")
         print(f"+ {biggest_right}")
         print(f" magnitude = {biggest}")
+        return biggest
 
 
     def parse(self, line, depth):
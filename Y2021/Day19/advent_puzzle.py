@@ -23,6 +23,17 @@ class AdventPuzzle():
         self.scanners = [scanner for scanner in Scanner.generator(self.lines)]
         self.beacons = {}
         
+        # the slow work is done by the part that needs it, part 1 matches the beacons seen
+        # by several scanners (match_beacons) and part 2 also locates the scanners (locate_scanners)
+        self.matched = False
+        self.located = False
+
+    def match_beacons(self):
+        """identify the beacons observed by more than one scanner, and give every beacon a unique id"""
+        if self.matched:
+            return
+        self.matched = True
+        
         # the first step here is to identify beacons which are observed by multiple scanners
         # and to assign a unique beacon id so that all scanners will see them as the same beacons
         for ixa, scanner_a in enumerate(self.scanners):
@@ -69,6 +80,13 @@ class AdventPuzzle():
         
         # for beacon_id, pairs in self.beacons.items():
             # print(f"beacon_id {beacon_id:3d} {len(pairs)} pairs {pairs}")
+
+    def locate_scanners(self):
+        """find the orientation and location of each scanner, and the largest distance between two scanners"""
+        if self.located:
+            return
+        self.located = True
+        self.match_beacons()
         
         # include the unique beacon ids with the Beacon objects listed in each scanner
         for isx, scanner in enumerate(self.scanners):
@@ -164,17 +182,21 @@ class AdventPuzzle():
 
     def puzzle_part1(self):
         """run  part1 of puzzle"""
+        self.match_beacons()
         
         print(f"{Beacon.unique_beacon_id} unique beacons found")
+        return Beacon.unique_beacon_id
 
         
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
+        self.locate_scanners()
         
         max_manhattan, sa, sb = self.max_manhattan
         print(f"Largest Manhattan distance between two scanners is {max_manhattan}")
         print(f" for Scanner {sa} and Scanner {sb}")
+        return max_manhattan
         
         
     def prepare_input_list(self, lines):
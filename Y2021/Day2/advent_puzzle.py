@@ -14,55 +14,90 @@ description = ("product of final horizontal position and final depth",       # p
 #   that.  
 
 
+# the course is compiled into (opcode, value) pairs
+#   FORWARD  value      move forward
+#   AIM      value      'down' (+value) and 'up' (-value), which only change the
+#                       depth in part 1 and only change the aim in part 2
+FORWARD = 0
+AIM = 1
+
+OPCODES = {'forward': (FORWARD, +1), 'down': (AIM, +1), 'up': (AIM, -1)}
+
+
 def puzzle_part1(lines):
     """run  part1 of puzzle"""
-    commands = prepare_input_list(lines)
-    horizontal = 0
-    depth = 0
-    for cmd, val in commands:
-        if cmd == 'forward':
-            horizontal += val
-        elif cmd == 'down':
-            depth += val
-        elif cmd == 'up':
-            depth -= val
-        else:
-            print(f"invalid command '{cmd}'")
+    # both parts are computed in one pass over the course, by the first part to run
+    horizontal, depth, _, _ = advent.prepared(run_course, lines)
             
     print(f"final horizontal position={horizontal}, final depth={depth}")
     print(f"product={horizontal * depth}")
+    return horizontal * depth
         
         
         
 def puzzle_part2(lines):
     """run part2 of puzzle"""
-    commands = prepare_input_list(lines)
-    horizontal = 0
-    depth = 0
-    aim = 0
-    for cmd, val in commands:
-        if cmd == 'forward':
-            horizontal += val
-            depth += aim * val
-        elif cmd == 'down':
-            aim += val
-        elif cmd == 'up':
-            aim -= val
-        else:
-            print(f"invalid command '{cmd}'")
+    # both parts are computed in one pass over the course, by the first part to run
+    horizontal, _, depth, aim = advent.prepared(run_course, lines)
             
     print(f"final horizontal position={horizontal}, final depth={depth}, aim={aim}")
     print(f"product={horizontal * depth}")
+    return horizontal * depth
     
 
-def prepare_input_list(lines):
-    """convert each line into a list with a command and a number"""
-    
-    return [[cmd, int(number)] for (cmd, number) in (line.rstrip().split() for line in lines)]
+def compile_course(commands):
+    """generate the (opcode, value) program for the commands
+         runs of the same opcode are added together into one instruction: consecutive
+         forwards (the aim does not change during them) and consecutive downs and ups
+         have the same effect as a single forward, down or up by their sum
+    """
+    opcode = None
+    total = 0
+    for op, value in commands:
+        if op is None:
+            continue
+        if op != opcode:
+            if opcode is not None:
+                yield opcode, total
+            opcode = op
+            total = 0
+        total += value
+    if opcode is not None:
+        yield opcode, total
+
+
+def run_course(lines):
+    """run the course (the command lines, streamed or a list), with the part 1 and part 2 meanings at once
+         returns the horizontal position, the part 1 depth, the part 2 depth and the aim
+    """
+    horizontal = 0
+    depth = 0           # part 1, down and up change the depth
+    aim = 0             # part 2, down and up change the aim
+    aimed_depth = 0     # part 2, forward changes the depth by aim * value
+    for opcode, value in compile_course(map(prepare_line, lines)):
+        if opcode == FORWARD:
+            horizontal += value
+            aimed_depth += aim * value
+        else:
+            depth += value
+            aim += value
+    return horizontal, depth, aimed_depth, aim
+
+
+def prepare_line(line):
+    """convert a line into an (opcode, value) instruction (applied to each line as it is run)
+         down and up become AIM instructions with a positive and a negative value
+    """
+    cmd, value = advent.split__command_number(line)
+    if cmd not in OPCODES:
+        print(f"invalid command '{cmd}'")
+        return None, 0
+    opcode, sign = OPCODES[cmd]
+    return opcode, sign * value
 
 
 # import code common for all Advent puzzles
 import advent 
 # pass module name, and package
-advent.startup(__name__, __package__)
+advent.startup(__name__, __package__, stream=True)
 
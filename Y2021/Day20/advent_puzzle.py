@@ -26,6 +26,8 @@ def from_binary(line):
     """translate '0' and '1' to '.' and '#' """
     return line.translate(from_binary_trans_table)
 
+import grid
+
 class AdventPuzzle():
     def __init__(self, lines):
         """initialize the AdventPuzzle object"""
@@ -34,107 +36,98 @@ class AdventPuzzle():
     def puzzle_part1(self):
         """run  part1 of puzzle"""
         self.prepare_input_list(self.lines)
-        self.run_enhance(2)
+        return self.run_enhance(2)
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
         self.prepare_input_list(self.lines)
-        self.run_enhance(50)
+        return self.run_enhance(50)
 
     def run_enhance(self, cycles):
-        """run the image enhancement algorithm for the number of cycles requested"""
-        # enlarge the image with '.' the first time
-        # because of the infinity effects, the edges will alternate all '0's and all '1's
-        self.enlarge(1, first=True)
+        """run the image enhancement algorithm for the number of cycles requested, return the pixels lit"""
+        if advent.use_numpy():
+            return self.run_enhance_numpy(cycles)
+        
+        # the image grows by one pixel on each edge with each cycle, so it is put in a grid
+        # with a border big enough for all of the cycles (plus one more for the 3x3 squares
+        # at the edges).  Because of the infinity effects, the pixels outside the image are
+        # all the same, they are all '0's at the start and then all follow 'background'
+        pad = cycles + 1
+        image = grid.Grid.from_rows(self.image, pad=pad)
+        background = 0
         for k in range(cycles):
-            # enlarge the image at the edges, duplicating the current edge
-            self.enlarge(1)
-            # apply the enhancement algorithm to the image
-            self.enhance()
-            # remove the edges to get rid of the infinity effects
-            self.chop_edges(1)
-            # re-enlarge to recover its size
-            self.enlarge(1)
+            # apply the enhancement algorithm to the image (including the part of the
+            # border the image has grown into)
+            image, background = self.enhance(image, background, grow=k+1)
         
-        self.print_image()
-        print(f"after {cycles} cycles, {self.count_pixels()} pixels are lit")
+        self.print_image(image, grow=cycles)
+        lit = self.count_pixels(image, grow=cycles)
+        print(f"after {cycles} cycles, {lit} pixels are lit")
+        return lit
 
-    def count_pixels(self):
-        """count the number of pixels 'lit' in the image"""
-        count = 0
-        for line in self.image:
-            for c in line:
-                if c == '1':
-                    count += 1
-        return count
-        
+    def run_enhance_numpy(self, cycles):
+        """run the image enhancement algorithm with NumPy array operations, return the pixels lit"""
+        np = advent.np
+        table = np.array(self.image_enhance_table, dtype=np.uint8)
+        image = np.array(self.image, dtype=np.uint8)
+        background = 0
+        for k in range(cycles):
+            # the image grows by one pixel on each edge, pad it with the background
+            # (and one more pixel for the 3x3 squares at the new edges)
+            padded = np.pad(image, 2, constant_values=background)
+            height, width = image.shape[0] + 2, image.shape[1] + 2
+            # the index into the enhancement algorithm table of every pixel's 3x3 square
+            index = np.zeros((height, width), dtype=np.int64)
+            for dx, dy in grid.SQUARE:
+                index = index*2 + padded[1+dy:1+dy+height, 1+dx:1+dx+width]
+            image = table[index]
+            background = int(table[511 if background else 0])
         
-    def enlarge(self, amount=1, first=False):
-        """enlarge the image by adding to the top, bottom and sides"""
-        if first:
-            char_to_add = '0'
-        else:
-            # the character at 0,0 actually appears on all four edges
-            char_to_add = self.image[0][0]
-            
-        for i in range(amount):
-            line_len = len(self.image[0])
-            top_bottom = char_to_add * line_len
-            new_image = list(self.image)
-            # add top and bottom rows to the image
-            new_image.insert(0,top_bottom)
-            new_image.append(top_bottom)
-            # expand all rows on left and right
-            self.image = [''.join((char_to_add, line, char_to_add)) for line in new_image]
+        # (the grid is only built when it will be printed)
+        if advent.showing():
+            self.print_image(grid.Grid.from_rows(image.tolist()), grow=0)
+        lit = int(image.sum(dtype=np.int64))
+        print(f"after {cycles} cycles, {lit} pixels are lit")
+        return lit
 
-
-    def chop_edges(self, amount=1):
-        """remove the edges"""
-        image = self.image[amount:-amount]
-        self.image = [line[amount:-amount] for line in image]
+    def count_pixels(self, image, grow):
+        """count the number of pixels 'lit' in the image"""
+        cells = image.cells
+        return sum(cells[i] for i in image.interior(grow))
+        
             
-    
-    neighbors = ((-1,-1), ( 0,-1), (+1,-1), 
-                 (-1, 0), ( 0, 0), (+1, 0),
-                 (-1,+1), ( 0,+1), (+1,+1))
-                 
-    def gen_image_line(self):
-        """generate an image line by applying the enhancement algorithm"""
-        len_x = len(self.image[0])
-        len_y = len(self.image)
-        for y, line in enumerate(self.image):
-            new_line = []
-            for x in range(len_x):
-                v = 0
-                for dx, dy in AdventPuzzle.neighbors:
-                    v *= 2
-                    xp = x+dx
-                    yp = y+dy
-                    if 0 <= xp < len_x and 0 <= yp < len_y:
-                        i = int(self.image[yp][xp])
-                    else:
-                        i = 0
-                    v += i
-                # v now has index into enhancement algorithm string
-                c = self.image_enhance_table[v]
-                new_line.append(c) 
-            yield ''.join(new_line)
-    
-    def enhance(self):
-        """enhance the image by applying the enhancement algorithm to the image"""
-        self.image = [line for line in self.gen_image_line()]
+    def enhance(self, image, background, grow):
+        """enhance the image by applying the enhancement algorithm to the image
+             returns the new image and its new background (the value of all of the pixels outside it)
+        """
+        table = self.image_enhance_table
+        cells = image.cells
+        # the flat index offsets of the 3x3 square around a pixel, in reading order
+        square = image.offsets(grid.SQUARE)
+        
+        # the background becomes the table entry for a 3x3 square of background pixels
+        new_background = table[511 if background else 0]
+        new_image = image.copy()
+        new_image.fill(new_background)
+        new_cells = new_image.cells
+        for i in image.interior(grow):
+            v = 0
+            for delta in square:
+                v = v*2 + cells[i+delta]
+            # v now has index into enhancement algorithm table
+            new_cells[i] = table[v]
+        return new_image, new_background
         
             
-    def print_image(self, image=None, raw=False):
+    def print_image(self, image, grow):
         """print the current image"""
-        # return
-        if image is None:
-            image = self.image
-        for line in image:
-            if raw:
-                print(line)
-            else:
-                print(from_binary(line))
+        if not advent.showing():
+            return
+        # the image (and the part of the border it has grown into)
+        chars = from_binary('01')
+        for y in range(-grow, image.height + grow):
+            start = image.index(-grow, y)
+            print(''.join(chars[c] for c in image.cells[start:start + image.width + 2*grow]))
         print()
                 
 
@@ -144,11 +137,11 @@ class AdventPuzzle():
         # first line is the image enhancement algorithm
         self.lines = lines
         lines = list(lines)
-        self.image_enhance_table = to_binary(lines.pop(0))
+        self.image_enhance_table = [int(c) for c in to_binary(lines.pop(0))]
         # remove the blank line
         lines.pop(0)
         # now get the image
-        self.image = [to_binary(line) for line in lines]
+        self.image = [[int(c) for c in to_binary(line)] for line in lines]
         
     
 # import code common for all Advent puzzles
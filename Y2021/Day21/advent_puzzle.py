@@ -46,6 +46,7 @@ class AdventPuzzle():
         print(f"loser score is {loser_score}")
         print()
         print(f"product is {die.roll_count * loser_score}")
+        return die.roll_count * loser_score
             
     def puzzle_part2(self):
         """run part2 of puzzle"""
@@ -57,6 +58,8 @@ class AdventPuzzle():
         print(f"Player 2 wins in {player_2_wins:20d} universes")
         print()
         print(self.find_wins.cache_info())
+        advent.diagnostic('cache_info', self.find_wins.cache_info()._asdict())
+        return max(player_1_wins, player_2_wins)
 
 
     # caching the results of this function improves the performance from approximately
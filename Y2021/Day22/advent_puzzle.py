@@ -42,10 +42,11 @@ class AdventPuzzle():
                 new_commands.append(command)
         self.commands = new_commands
         # now run the puzzle_part2 algorithm with the restricted set of commands
-        self.puzzle_part2()
+        total_on = self.puzzle_part2()
         
         # restore the original commands
         self.commands = old_commands
+        return total_on
         
         
     def puzzle_part2(self):
@@ -93,6 +94,7 @@ class AdventPuzzle():
             cube_list.insert(0, new_cube)
     
         print(f"total on = {total_on}")
+        return total_on
     
     
     def prepare_input_list(self, lines):
@@ -40,17 +40,17 @@ class AdventPuzzle():
     def puzzle_part1(self):
         """run  part1 of puzzle"""
         
-        self.run_algorithm(self.rooms1)
+        return self.run_algorithm(self.rooms1)
         
         
     def puzzle_part2(self):
         """run part2 of puzzle"""
         
-        self.run_algorithm(self.rooms2)
+        return self.run_algorithm(self.rooms2)
     
     
     def run_algorithm(self, rooms):
-        """run the movement algorithm with the input state"""
+        """run the movement algorithm with the input state, return the lowest cost"""
         
         # initial empty state of the hallway
         hallway = (None, None, 'X', None, 'X', None, 'X', None, 'X', None, None)
@@ -60,6 +60,8 @@ class AdventPuzzle():
         ans = self.find_path((hallway, rooms))
         print(self.find_path.cache_info())
         print(f"lowest cost scheme is {ans}")
+        advent.diagnostic('cache_info', self.find_path.cache_info()._asdict())
+        return ans
     
     
     @lru_cache(maxsize=None)    
@@ -211,6 +213,8 @@ class AdventPuzzle():
     
     def print(self, hallway, rooms, indent=0, text=None):
         """print a representation of the current state"""
+        if not advent.showing():
+            return
         if text:
             print(text)
         print(' '*indent, end='')
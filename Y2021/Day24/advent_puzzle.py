@@ -81,14 +81,16 @@ class AdventPuzzle():
             
             if step_type == 'store':
                 # this step is a store; push the value onto the stack
-                indent = ' ' * (len(stack) * 2)
-                print(f"{indent}store push ({step},{step_val})")
+                if advent.showing():
+                    indent = ' ' * (len(stack) * 2)
+                    print(f"{indent}store push ({step},{step_val})")
                 stack.insert(0, (step, step_val))
             else:
                 # this step is a check; pop the stored value from the stack
                 store_step, store_val = stack.pop(0)
-                indent = ' ' * (len(stack) * 2)
-                print(f"{indent}check pop  ({store_step},{store_val}) with {step_val}")
+                if advent.showing():
+                    indent = ' ' * (len(stack) * 2)
+                    print(f"{indent}check pop  ({store_step},{store_val}) with {step_val}")
                 w_check = store_val + step_val
                 # find the highest pair of input digits (1:9) that satisfy the equation
                 if w_check > 0:
@@ -99,6 +101,7 @@ class AdventPuzzle():
                     w[store_step] = 9
         print()       
         print(f"largest valid model number = {''.join([str(v) for v in w])}")
+        return ''.join([str(v) for v in w])
         
     
     def puzzle_part2(self):
@@ -110,14 +113,16 @@ class AdventPuzzle():
             
             if step_type == 'store':
                 # this step is a store; push the value onto the stack
-                indent = ' ' * (len(stack) * 2)
-                print(f"{indent}store push ({step},{step_val})")
+                if advent.showing():
+                    indent = ' ' * (len(stack) * 2)
+                    print(f"{indent}store push ({step},{step_val})")
                 stack.insert(0, (step, step_val))
             else:
                 # this step is a check; pop the stored value from the stack
                 store_step, store_val = stack.pop(0)
-                indent = ' ' * (len(stack) * 2)
-                print(f"{indent}check pop  ({store_step},{store_val}) with {step_val}")
+                if advent.showing():
+                    indent = ' ' * (len(stack) * 2)
+                    print(f"{indent}check pop  ({store_step},{store_val}) with {step_val}")
                 w_check = store_val + step_val
                 # find the lowest pair of input digits (1:9) that satisfy the equation
                 if w_check > 0:
@@ -129,6 +134,7 @@ class AdventPuzzle():
         
         print()        
         print(f"smallest valid model number = {''.join([str(v) for v in w])}")
+        return ''.join([str(v) for v in w])
         
         
     def prepare_input_list(self, lines):
@@ -4,7 +4,7 @@ description = (("Move the seq cucumbers until they can't move any more",
                ("",        # part 2       
                 "") 
               )
-import copy
+import grid
 
 # to run:
 #   put advent_puzzle.py and advent.py into a folder
@@ -17,92 +17,79 @@ import copy
 #   that.  
 
 
+# the contents of a location, and the characters used for them in the input
+EMPTY, EAST, SOUTH = 0, 1, 2
+CHARS = '.>v'
+
+
 class AdventPuzzle():
     def __init__(self, lines):
         """initialize the AdventPuzzle object"""
         self.grid = self.prepare_input_list(lines)
 
-    def any_movement(self, grid):
-        """return True if the two grids differ, else False"""
-        for grid_row, self_row in zip(grid, self.grid):
-            if grid_row != self_row:
-                return True
-        return False
-
     def print(self, grid=None):
         """print the grid"""
+        if not advent.showing():
+            return
         if grid == None:
             grid = self.grid
-        for line in grid:
-            for c in line:
-                print(c, end='')
-            print()
+        for line in grid.to_lines(CHARS):
+            print(line)
         print()
 
     def puzzle_part1(self):
         """run  part1 of puzzle"""
+        if not advent.use_numpy():
+            # the target location of each location's sea cucumber (the sea cucumbers
+            # wrap around to the opposite edge), the numpy code does not need them
+            self.east = [target[0] for target in self.grid.neighbor_table(((1,0),), wrap=True)]
+            self.south = [target[0] for target in self.grid.neighbor_table(((0,1),), wrap=True)]
+        
         for steps in range(1,60000):
-            if steps % 100 == 0:
+            if steps % 100 == 0 and advent.showing():
                 print(f"{steps} executed")
-            half_step = self.step_east(self.grid)
-            full_step = self.step_south(half_step)
-            if not self.any_movement(full_step):
+            if advent.use_numpy():
+                moved = self.step_numpy(EAST, axis=1)
+                moved += self.step_numpy(SOUTH, axis=0)
+            else:
+                moved = self.step(EAST, self.east)
+                moved += self.step(SOUTH, self.south)
+            if not moved:
                 print(f"no movement after {steps} steps")
                 break
-            self.grid = full_step
-        
-    def step_east(self, grid):
-        """move the eastbound sea cucumbers"""
-        ll = len(grid[0])
+        return steps
         
-        new_grid = []
-        for line in grid:
-            new_line = copy.copy(line)
-            for i, c in enumerate(line):
-                if c == '>':
-                    # this location contains an eastbound sea cucumber
-                    # compute its target location
-                    tgt = i+1
-                    if tgt == ll:
-                        tgt = 0
-                    if line[tgt] == '.':
-                        # the target location is empty so move
-                        new_line[tgt] = '>'
-                        new_line[i] = '.'
-            new_grid.append(new_line)
-        return new_grid
-
-    def step_south(self, grid):
-        """move the southbound sea cucumbers"""
-        l_row = len(grid[0])
-        l_col = len(grid)
-        new_grid = copy.deepcopy(grid)
-        
-        for col in range(l_row):
-            for row in range(l_col):
-                c = grid[row][col]
-                if c == 'v':
-                    # this location contains a southbound sea cucumber
-                    # compute its target location
-                    tgt = row+1
-                    if tgt == l_col:
-                        tgt = 0
-                    if grid[tgt][col] == '.':
-                        # the target location is empty so move
-                        new_grid[tgt][col] = 'v'
-                        new_grid[row][col] = '.'
-        return new_grid
+    def step(self, herd, targets):
+        """move the sea cucumbers of one herd (EAST or SOUTH), return how many moved"""
+        cells = self.grid.cells
+        # all of the herd's sea cucumbers look at the grid before any of them move
+        movers = [i for i, c in enumerate(cells) if c == herd and cells[targets[i]] == EMPTY]
+        for i in movers:
+            # the target location is empty so move
+            cells[targets[i]] = herd
+            cells[i] = EMPTY
+        return len(movers)
+    
+    def step_numpy(self, herd, axis):
+        """move the sea cucumbers of one herd with NumPy array operations, return how many moved
+             axis is the direction the herd moves in (1 for EAST, 0 for SOUTH)
+        """
+        np = advent.np
+        # a view of the grid's cells, the grid is updated in place
+        cells = self.grid.to_numpy()
+        # the herd's sea cucumbers whose target location (wrapping around) is empty
+        movers = (cells == herd) & (np.roll(cells, -1, axis=axis) == EMPTY)
+        cells[movers] = EMPTY
+        cells[np.roll(movers, 1, axis=axis)] = herd
+        return int(movers.sum())
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
         
         
     def prepare_input_list(self, lines):
-        """create a list of the input"""
-        
-        grid = [[c for c in line] for line in lines]
-            
-        return grid
+        """create a grid of the input"""
+        return grid.Grid.from_rows([[CHARS.index(c) for c in line] for line in lines])
     
 # import code common for all Advent puzzles
 import advent 
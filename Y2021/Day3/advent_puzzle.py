@@ -14,95 +14,167 @@ description = ("Calculate submarine power consumption",       # part 1
 #   that.  
 
 
+from array import array
+from bisect import bisect_left
+
+
 def puzzle_part1(lines):
     """run  part1 of puzzle"""
 
-    report = prepare_input_list(lines)
+    report = advent.prepared(prepare_input_list, lines)
+    num_bits = report.num_bits
 
-    # get the number of bits in each line
-    num_bits = len(report[0])
+    # count the one bits in each column of the report (the bits are numbered from the left)
+    ones = report.column_ones()
     
     # gamma will be a line which contains the bit values that are the most common 
     # in each column of the input
-    gamma = [find_common_bit(report, bit_num, 'most common', tie_goes_to=None) for bit_num in range(num_bits)]
+    gamma = 0
+    for bit_position in range(num_bits):
+        common_bit = find_common_bit(ones[bit_position], report.size - ones[bit_position],
+                                     'most common', tie_goes_to=None)
+        gamma = (gamma << 1) | common_bit
     
-    gamma_string = ''.join(gamma)
-    gamma_decimal = int(gamma_string, 2)
-    print(f"gamma    {gamma_string}   {gamma_decimal:9d}")
+    print(f"gamma    {gamma:0{num_bits}b}   {gamma:9d}")
     
     # epsilon is just the inverse of the bits in gamma
-    epsilon = ['1' if bit == '0' else '0' for bit in gamma]
+    epsilon = gamma ^ ((1 << num_bits) - 1)
     
-    epsilon_string = ''.join(epsilon)
-    epsilon_decimal = int(epsilon_string, 2)
-    print(f"epsilon  {epsilon_string}   {epsilon_decimal:9d}")
+    print(f"epsilon  {epsilon:0{num_bits}b}   {epsilon:9d}")
     
-    power_consumption = gamma_decimal * epsilon_decimal
+    power_consumption = gamma * epsilon
     print(f"power_consumption       {power_consumption:9d}")
+    return power_consumption
 
     
 def puzzle_part2(lines):
     """run part2 of puzzle"""
     
-    report = prepare_input_list(lines)
+    report = advent.prepared(prepare_input_list, lines)
 
-    # get the number of bits in each line
-    num_bits = len(report[0])
-    
-    oxygen_rating = get_rating(report, num_bits, 'most common')
+    oxygen_rating = get_rating(report, 'most common')
     print(f"oxygen generator rating {oxygen_rating:9d}")
         
-    co2_rating = get_rating(report, num_bits, 'least common')
+    co2_rating = get_rating(report, 'least common')
     print(f"co2 scrubber rating     {co2_rating:9d}")
     
     life_support_rating = oxygen_rating * co2_rating
     print(f"life support rating     {life_support_rating:9d}")
+    return life_support_rating
 
 
 def prepare_input_list(lines):
-    # convert each line to a list of characters (which are binary bits)
-    return [list(line) for line in lines]
+    """build the trie index of the report (each line is a binary number)"""
+    return ReportTrie((int(line, 2) for line in lines), num_bits=len(lines[0]))
+
+
+class ReportTrie():
+    """a binary trie of the report's values, with the number of values below each node
+         the trie is built once, then any number of rating queries are walks from the
+         root, one node per bit.  A node with a single value below it is a leaf (the
+         rest of its path would only have one way down), the value is kept in the node
+    """
+    def __init__(self, values, num_bits):
+        self.num_bits = num_bits
+        # node n's children are children[2*n] (a 0 bit) and children[2*n+1] (a 1 bit), 0 is
+        # no child (node 0 is the root, it is never a child).  counts[n] is the number of values
+        # below node n, depths[n] is its depth (the bit position of its children) and firsts[n]
+        # is the index of its first value in the sorted values
+        #
+        # the values below a node are a contiguous range of the sorted values (they share
+        # the node's prefix), and the range is split between the node's children with a
+        # binary search.  So the trie costs a binary search per node, not a step per bit
+        # of every value.  nodes[n] is (low, high, prefix, depth) for node n, a node's
+        # children are added to the end of the list (after the nodes before it)
+        # 'Q' holds words of up to 64 bits
+        self.values = values = array('Q', sorted(values))
+        nodes = [(0, len(values), 0, 0)]
+        children = [0, 0]
+        for node, (low, high, prefix, depth) in enumerate(nodes):
+            if depth == num_bits or high - low == 1:
+                continue
+            bit = 1 << (num_bits - 1 - depth)
+            split = bisect_left(values, prefix | bit, low, high)
+            if split > low:
+                children[2*node] = len(nodes)
+                nodes.append((low, split, prefix, depth + 1))
+                children += (0, 0)
+            if high > split:
+                children[2*node+1] = len(nodes)
+                nodes.append((split, high, prefix | bit, depth + 1))
+                children += (0, 0)
+        
+        self.children = array('l', children)
+        self.counts = array('l', [high - low for low, high, _, _ in nodes])
+        self.depths = array('l', [depth for _, _, _, depth in nodes])
+        self.firsts = array('l', [low for low, _, _, _ in nodes])
+
+    @property
+    def size(self):
+        """the number of values in the trie"""
+        return self.counts[0]
+
+    def ones_and_zeros(self, node):
+        """the number of values below node with a 1 and with a 0 in the next bit"""
+        zero, one = self.children[2*node], self.children[2*node+1]
+        return (self.counts[one] if one else 0), (self.counts[zero] if zero else 0)
+
+    def column_ones(self):
+        """the number of one bits in each column (bit position, numbered from the left)"""
+        ones = []
+        for bit_position in range(self.num_bits):
+            mask = 1 << (self.num_bits - 1 - bit_position)
+            # the sum of the masked values is mask times the number of ones (map and sum run
+            # in C, this is quicker than visiting the trie's nodes)
+            ones.append(sum(map(mask.__and__, self.values)) // mask)
+        return ones
+
+    def rating(self, which, tie_goes_to):
+        """walk from the root choosing the most or least common bit at each node (see get_rating)"""
+        node = 0
+        value = 0
+        for _ in range(self.num_bits):
+            if self.counts[node] == 1:
+                # a leaf, its value is the only one left
+                return self.values[self.firsts[node]]
+            ones, zeros = self.ones_and_zeros(node)
+            if ones and zeros:
+                common_bit = find_common_bit(ones, zeros, which, tie_goes_to)
+            else:
+                # all of the remaining values (or the only one) have the same bit here
+                common_bit = 1 if ones else 0
+            value = (value << 1) | common_bit
+            node = self.children[2*node + common_bit]
+        return value
     
 
-def get_rating(report, num_bits, which):
-    """calculate rating based on either least or most common bits"""
+def get_rating(report, which, tie_goes_to=None):
+    """calculate rating based on either least or most common bits
+         for each bit position (starting on the left) only the lines which match the 'most common'
+         or 'least common' bit (of the lines left) are kept, until one line is left.
+         tie_goes_to is the bit kept when there are as many ones as zeros, the default
+         is 1 for 'most common' and 0 for 'least common'
+    """
     
     # set 'tie_goes_to' based on whether we are finding 'most' or 'least' common bit
-    tie_goes_to = '1' if which == 'most common' else '0'
-    
-    # for each bit position (starting on the left) in the report lines
-    # remove the lines which don't match the 'most common' or 'least common' criteria
-    for bit_position in range(num_bits):
-        # we will build a new report list with only the lines that meet the criteria
-        common_bit = find_common_bit(report, bit_position, which, tie_goes_to)
-        report = [bit_line for bit_line in report if bit_line[bit_position] == common_bit]
-        
-        # when there is only one line left in the report we are done
-        if len(report) == 1:
-            break
-            
-    # convert the final report line to a binary string 
-    rating_string = ''.join(report[0])
+    if tie_goes_to is None:
+        tie_goes_to = 1 if which == 'most common' else 0
     
-    # convert the binary string to an integer using base-2 conversion
-    return int(rating_string, 2)
+    return report.rating(which, tie_goes_to)
     
 
-def find_common_bit(report, bit_position, which, tie_goes_to):
-    """find the most or least common bit in the given bit position"""
-    ones = 0
-    # look at each of the lines in the report and find the number of one bits
-    # in the given bit position
-    for bit_line in report:
-        ones += (1 if bit_line[bit_position] == '1' else -1)
+def find_common_bit(ones, zeros, which, tie_goes_to):
+    """find the most or least common bit, given the number of ones and zeros in a bit position"""
         
     # based on whether we are finding the 'most common' or 'least common' bit in this position
     # return the result.  If the number of ones equals the number of zeros, return the
     # 'tie_goes_to' value
-    if ones > 0:
-        result = '1' if which == 'most common' else '0'
-    elif ones < 0:
-        result = '0' if which == 'most common' else '1'
+    if ones > zeros:
+        result = 1 if which == 'most common' else 0
+    elif ones < zeros:
+        result = 0 if which == 'most common' else 1
+    elif tie_goes_to is None:
+        raise ValueError("the ones and zeros are tied, and there is no tie_goes_to")
     else:
         result = tie_goes_to
     return result
@@ -19,130 +19,204 @@ description = (("Play bingo with a squid",                          # part 1
 def puzzle_part1(lines):
     """run part1 of puzzle"""
     
-    play_bingo(lines, return_first_win=True)
+    return report_win(lines, first_win=True)
     
     
 def puzzle_part2(lines):
     """run  part2 of puzzle"""
     
-    play_bingo(lines, return_first_win=False)
-
-
-def play_bingo(lines, return_first_win):
-    """play the bingo game"""
-    numbers_strs = lines.pop(0).rstrip().split(',')
-    drawn_numbers = [int(n) for n in numbers_strs]
-    
-    boards = get_boards(lines)
-    # number of boards that haven't won yet
-    boards_left = 1 if return_first_win else len(boards)
-
-    winning_board = None
-    # draw the numbers until we find the winner
-    for number in drawn_numbers:
-        for n, board in enumerate(boards):
-            # apply the drawn number to each board (board may be None which will always return False)
-            if apply_number_to_board(number, board):
-                # if the board included the drawn number, check if it is a winner
-                if is_winner(board):
-                    if boards_left == 1:
-                        # this is the last board to win
-                        winning_board = n
-                        print(f"We have the winner!  -- board number {n}")
-                        print_board(board)
-                        print_score(board, number)
-                        break
-                    else:
-                        # this is not the last winner, just remove the board from the list and 
-                        # continue
-                        boards[n] = None
-                        boards_left -= 1
-                        
-        if winning_board is not None:
-            break    
-
-    
-def print_score(board, number):
-    """print the final score"""
-    sum_unmarked = 0
-    # add up all the 'unmarked' squares
-    for line in board:
-        for val in line:
-            if val < 100:
-                sum_unmarked += val
+    return report_win(lines, first_win=False)
+
+
+def report_win(lines, first_win):
+    """print the first (or last) board to win, return its score"""
+    
+    # the whole game is played once (by the first part to run), every board's win
+    # is recorded in the order they win.  The wins depend on the engine and the backend
+    # used, a change of either plays the game again
+    drawn_numbers, boards = advent.prepared(prepare_input_list, lines)
+    wins = advent.prepared(play_game, lines, settings=(engine, advent.backend))
+    if not wins:
+        print("no board won")
+        return None
+    
+    board_number, turn, number, sum_unmarked = wins[0] if first_win else wins[-1]
+    print(f"We have the winner!  -- board number {board_number}")
+    print_board(boards[board_number], set(drawn_numbers[:turn+1]))
+    return print_score(sum_unmarked, number)
+
+
+# the python engines that find the boards' wins (they find the same wins)
+#   'closed form'   compute each board's win turn from the draw order (find_wins), the default
+#   'simulate'      play the game draw by draw (play_bingo)
+# with the numpy backend the closed form is computed for all of the boards at once
+ENGINES = ('closed form', 'simulate')
+
+engine = 'closed form'
+
+
+def play_game(lines):
+    """find when each board wins with the input's numbers and boards"""
+    drawn_numbers, boards = advent.prepared(prepare_input_list, lines)
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+    if engine == 'simulate':
+        return play_bingo(drawn_numbers, boards)
+    if advent.use_numpy() and len({(len(board), len(board[0])) for board in boards}) == 1:
+        return find_wins_numpy(drawn_numbers, boards)
+    return find_wins(drawn_numbers, boards)
+
+
+def play_bingo(drawn_numbers, boards):
+    """play the bingo game until every board has won
+         returns the wins, in the order the boards won, as tuples of
+         (board number, turn, winning number, sum of the unmarked squares)
+         
+         the squares holding each number are indexed once, so a drawn number only
+         visits the squares that hold it.  Each board keeps a count of the marked
+         squares in each row and column (a win is a count reaching the board's size)
+         and the sum of its unmarked squares
+    """
+    # number -> list of (board number, row, column) of the squares holding it
+    positions = {}
+    for b, board in enumerate(boards):
+        for r, row in enumerate(board):
+            for c, val in enumerate(row):
+                positions.setdefault(val, []).append((b, r, c))
+    
+    row_hits = [[0] * len(board) for board in boards]
+    col_hits = [[0] * len(board[0]) for board in boards]
+    unmarked = [sum(map(sum, board)) for board in boards]
+    won = [False] * len(boards)
+    
+    wins = []
+    drawn = set()
+    for turn, number in enumerate(drawn_numbers):
+        # a number drawn again marks nothing new
+        if number in drawn:
+            continue
+        drawn.add(number)
+        # (a board wins after all of its squares with the number are marked)
+        winners = []
+        for b, r, c in positions.get(number, ()):
+            if won[b]:
+                continue
+            unmarked[b] -= number
+            row_hits[b][r] += 1
+            col_hits[b][c] += 1
+            if row_hits[b][r] == len(col_hits[b]) or col_hits[b][c] == len(row_hits[b]):
+                if b not in winners:
+                    winners.append(b)
+        for b in winners:
+            won[b] = True
+            wins.append((b, turn, number, unmarked[b]))
+        if len(wins) == len(boards):
+            break
+    
+    return wins
+
+
+# the draw order is known before the game starts, so the game does not need to be
+# played.  A line (row or column) is complete at the turn its last number is drawn,
+# the latest draw of any of its numbers, and a board wins at the turn its first
+# line is complete.  So with each number mapped to the turn it is drawn
+#
+#     win turn = min over the board's lines of (max over the line of turn[number])
+#
+# and the board's unmarked squares are those whose number is drawn after that turn
+# (or never drawn)
+
+
+def draw_turns(drawn_numbers):
+    """map each drawn number to the turn it is (first) drawn"""
+    turns = {}
+    for turn, number in enumerate(drawn_numbers):
+        turns.setdefault(number, turn)
+    return turns
+
+
+def find_wins(drawn_numbers, boards):
+    """find the turn each board wins, without playing the game
+         returns the wins, in the order the boards win, as tuples of
+         (board number, turn, winning number, sum of the unmarked squares)
+    """
+    turns = draw_turns(drawn_numbers)
+    # numbers that are never drawn are never marked
+    never = len(drawn_numbers)
+    
+    wins = []
+    for b, board in enumerate(boards):
+        board_turns = [[turns.get(val, never) for val in row] for row in board]
+        win_turn = min(min(map(max, board_turns)),          # rows
+                       min(map(max, zip(*board_turns))))    # columns
+        if win_turn == never:
+            continue
+        sum_unmarked = sum(val for row, row_turns in zip(board, board_turns)
+                               for val, turn in zip(row, row_turns) if turn > win_turn)
+        wins.append((b, win_turn, drawn_numbers[win_turn], sum_unmarked))
+    
+    # boards that win on the same turn are in board order (the sort is stable)
+    wins.sort(key=lambda win: win[1])
+    return wins
+
+
+def find_wins_numpy(drawn_numbers, boards):
+    """find the turn each board wins with NumPy, all of the boards at once
+         the boards (which must all be the same size) are a boards x rows x columns
+         array, mapped through a lookup table to the turn each square is drawn
+    """
+    np = advent.np
+    squares = np.array(boards, dtype=np.int64)
+    drawn = np.array(drawn_numbers, dtype=np.int64)
+    never = len(drawn_numbers)
+    
+    # lookup table from number to the turn it is first drawn
+    turn_of = np.full(max(int(squares.max()), int(drawn.max(initial=0))) + 1, never, dtype=np.int64)
+    numbers, first_turns = np.unique(drawn, return_index=True)
+    turn_of[numbers] = first_turns
+    turns = turn_of[squares]
+    
+    # a line is complete at its latest turn, a board wins at its earliest complete line
+    win_turns = np.minimum(turns.max(axis=2).min(axis=1),       # rows
+                           turns.max(axis=1).min(axis=1))       # columns
+    sums_unmarked = np.where(turns > win_turns[:, None, None], squares, 0).sum(axis=(1, 2))
+    
+    # the first winner is the argmin of the win turns, the last the argmax, and the
+    # (stable) argsort orders all of the winners
+    order = np.argsort(win_turns, kind='stable')
+    order = order[win_turns[order] < never]
+    return [(int(b), int(win_turns[b]), drawn_numbers[win_turns[b]], int(sums_unmarked[b]))
+            for b in order]
+
+    
+def print_score(sum_unmarked, number):
+    """print (and return) the final score"""
     print(f"sum of unmarked squares = {sum_unmarked}")
     print(f"winning number          = {number}")
     score = sum_unmarked * number
     print(f"score = {score}")
+    return score
 
 
-def is_winner(board):
-    """check if this board has won"""
-    
-    # get the row and column size
-    row_col_max = len(board[0])
-    # list of sums for the columns
-    col_sums = [0] * row_col_max
-    for row in board:
-        row_sum = 0
-        for col, val in enumerate(row):
-            # for each marked square, increase the row and column counts and 
-            # see if the row or column is completely marked, indicating a winner
-            if val >= 100:
-                row_sum += 1
-                col_sums[col] += 1
-                if row_sum == row_col_max or col_sums[col] == row_col_max:
-                    # this board is a winner
-                    return True
-    return False
-
-
-def apply_number_to_board(number, board):
-    """apply the drawn number to a board"""
-    if board is not None:
-        for l, line in enumerate(board):
-            for v, val in enumerate(line):
-                if val == number:
-                    # mark the square by adding 100 to the square
-                    board[l][v] = val + 100
-                    # this board had the drawn number, and thus has changed
-                    return True
-    # this board did not have the drawn number
-    return False    
-
-
-def get_boards(lines):
-    """get the boards from the input lines"""
-    
-    # remove initial blank line
-    lines.pop(0)
+def prepare_input_list(lines):
+    """get the drawn numbers and the boards from the input lines"""
+    drawn_numbers = [int(n) for n in lines[0].rstrip().split(',')]
     
+    # the boards are separated by blank lines (after the blank line following the numbers)
     boards = []
-    while True:
-        # get the next board (if any)
-        board = new_board(lines)
-        if not board:
-            # if there are no more boards, exit the loop
-            break
-        boards.append(board)
-    
-    # return the list of boards    
-    return boards
-
-
-def new_board(lines):
-    """get the next board from the input lines"""
     board = []
-    while len(lines) > 0:
-        line = lines.pop(0)
+    for line in lines[2:]:
         if not line:
-            # break when we find the blank line at the end of a board
-            break
-        # convert the line into a list of integers
-        line = [int(n) for n in line.split()]
-        # and add it to the board's lines
-        board.append(line)
-    return board
+            if board:
+                boards.append(board)
+            board = []
+            continue
+        # convert the line into a list of integers, and add it to the board's lines
+        board.append([int(n) for n in line.split()])
+    if board:
+        boards.append(board)
+    
+    return drawn_numbers, boards
 
 
 # ANSI control codes for highlighting marked and unmarked squares 
@@ -151,14 +225,14 @@ BRIGHT = '\x1b[1m'  # for 'marked' squares
 DIM =    '\x1b[2m'  # for 'unmarked' squares
 
 
-def print_board(board):
-    """print a board"""
+def print_board(board, marked):
+    """print a board, highlighting the squares with a marked (drawn) number"""
+    if not advent.showing():
+        return
     for line in board:
         for val in line:
-            if val >= 100:
+            if val in marked:
                 # square is 'marked'
-                # recover the actual value of the square
-                val -= 100
                 style = BRIGHT  
             else:
                 # square is 'unmarked'
@@ -13,44 +13,81 @@ description = ("Horizontal and Vertical lines overlap at how many points?",
 #   them up to be able to be executed in a batch with more puzzles.  You can ignore
 #   that.  
 
+from bisect import bisect_left, bisect_right
+
+import grid
+
 
 def puzzle_part1(lines):
     """run  part1 of puzzle"""
-    lines = prepare_input_list(lines)
+    lines = advent.prepared(prepare_input_list, lines)
     
-    find_overlap(lines, include_diagonal=False)
+    return find_overlap(lines, include_diagonal=False)
                 
                     
 def puzzle_part2(lines):
     """run part2 of puzzle"""
     
-    lines = prepare_input_list(lines)
+    lines = advent.prepared(prepare_input_list, lines)
     
-    find_overlap(lines, include_diagonal=True)
+    return find_overlap(lines, include_diagonal=True)
+
+
+# the grid of counts has a cell for every point in the vent field, so its size grows
+# with the range of the coordinates, not with the number of lines.  When the grid
+# would be much bigger than the number of points on the lines (or just too big) the
+# overlaps are counted from the lines themselves instead (count_overlaps_sparse)
+SMALL_GRID_CELLS = 1 << 20      # a grid this size is always used
+MAX_GRID_CELLS = 1 << 26        # a grid bigger than this is never used (128MB of counts)
+DENSE_RATIO = 16                # otherwise, the grid is used if it is at most this many
+                                # times the number of points on the lines
 
 
 def find_overlap(lines, include_diagonal):
     """find the overlapping lines in the input"""
-    
-    # enable display of final grid for small input files
-    if len(lines) < 20:
-        show_grid = True
-    else:
-        show_grid = False
         
-    # find the maximum size of the grid
+    # find the maximum size of the grid, and the number of points on the lines
     max_x = 0
     max_y = 0
+    points = 0
     for line in lines:
         x0, y0 = line[0]
         x1, y1 = line[1]
         max_x = max(max_x, x0, x1)
         max_y = max(max_y, y0, y1)
+        points += max(abs(x1 - x0), abs(y1 - y0)) + 1
     print(f"max x,y = ({max_x}, {max_y})")
     
+    # choose the grid or the sparse counting by the density of the points in the field
+    cells = (max_x + 1) * (max_y + 1)
+    if cells <= SMALL_GRID_CELLS or (cells <= MAX_GRID_CELLS and cells <= DENSE_RATIO * points):
+        overlaps = count_overlaps_grid(lines, include_diagonal, max_x, max_y)
+    else:
+        print(f"sparse field ({points} points in {cells} cells), counting overlaps without a grid")
+        overlaps = count_overlaps_sparse(lines, include_diagonal)
+            
+    # display the puzzle result
+    print(f"count of overlaps>1 = {overlaps}")
+    return overlaps
+
+
+def count_overlaps_grid(lines, include_diagonal, max_x, max_y):
+    """count the overlaps by drawing the lines on a grid of counts"""
+    
+    # enable display of final grid for small input files
+    if len(lines) < 20 and advent.showing():
+        show_grid = True
+    else:
+        show_grid = False
+    
     # build a grid with max_y rows and max_x columns.  Each point starts at zero and is incremented
     # for each line that goes through the point.
-    grid = [[0 for _ in range(max_x+1)] for _ in range(max_y+1)]
+    counts = grid.Grid(max_x+1, max_y+1, typecode='H')
+    cells = counts.cells
+    
+    if advent.use_numpy():
+        add_lines_numpy(lines, include_diagonal, counts)
+        lines = []
     
     # process the lines and add them to the grid    
     for line in lines:
@@ -62,34 +99,209 @@ def find_overlap(lines, include_diagonal):
             (x, increment_x), (y, increment_y), line_range = xy_data
             
             # add each of the lines' points to the grid
-            while line_range >= 0:
-                grid[y][x] += 1
-                x += increment_x
-                y += increment_y
-                line_range -= 1
+            # (a step along the line is a fixed step through the grid's cells)
+            i = counts.index(x, y)
+            # (any non zero increment will do for a single point)
+            increment = increment_x + increment_y * counts.stride or 1
+            for i in range(i, i + line_range*increment + increment, increment):
+                cells[i] += 1
                 
         # the line did not meet the criteria        
         else:
             continue
     
     # now count how many points on the grid had more than one line crossing it        
-    overlaps = 0
-    for row in grid:
-        for count in row:
-            if count > 1:
-                overlaps += 1
-            if show_grid:
+    if advent.use_numpy():
+        overlaps = int((counts.to_numpy() > 1).sum())
+    else:
+        overlaps = counts.count_over(1)
+    if show_grid:
+        for row in counts.rows():
+            for count in row:
                 if count:
                     print(f"{count:2d}", end='')
                 else:
                     print(' .', end='')
-        if show_grid:
             print()
-            
-    # display the puzzle result
-    print(f"count of overlaps>1 = {overlaps}")
+    
+    return overlaps
 
+
+class Coverage():
+    """the number of segments covering each point of a row (or column) of the field
+         built from the segments' [start, end] intervals with a sweep line, it is
+         a sorted list of runs, each a start, end and the count of segments covering it
+    """
+    def __init__(self, intervals):
+        # +1 where a segment starts, -1 just after it ends
+        events = {}
+        for start, end in intervals:
+            events[start] = events.get(start, 0) + 1
+            events[end+1] = events.get(end+1, 0) - 1
+        
+        self.starts = []
+        self.ends = []
+        self.counts = []
+        count = 0
+        positions = sorted(events)
+        for position, next_position in zip(positions, positions[1:]):
+            count += events[position]
+            if count:
+                self.starts.append(position)
+                self.ends.append(next_position - 1)
+                self.counts.append(count)
+    
+    def runs(self):
+        """the runs, as (start, end, count)"""
+        return zip(self.starts, self.ends, self.counts)
     
+    def count_at(self, position):
+        """the number of segments covering a point"""
+        run = bisect_right(self.starts, position) - 1
+        if run >= 0 and position <= self.ends[run]:
+            return self.counts[run]
+        return 0
+
+
+# the directions of the lines, (dx, dy) with dx >= 0.  All of the lines in one
+# direction with the same key (x*dy - y*dx, which is the same for every point of the
+# line) are on the same row, column or diagonal of the field
+HORIZONTAL = (1, 0)
+VERTICAL = (0, 1)
+DIAGONALS = ((1, 1), (1, -1))
+
+
+def line_key(direction, x, y):
+    """the key of the row, column or diagonal (in direction) through x,y"""
+    dx, dy = direction
+    return x*dy - y*dx
+
+
+def line_point(direction, key, t):
+    """the point at position t (x, or y for a column) along the row, column or diagonal key"""
+    dx, dy = direction
+    if dx:
+        return t, t*dy - key
+    return key, t
+
+
+def count_overlaps_sparse(lines, include_diagonal):
+    """count the overlaps from the lines, without a grid
+         the lines in each row, column and diagonal of the field are swept into runs
+         of points covered by the same number of lines.  A point is an overlap if the
+         counts of the runs through it (one from each direction) add up to at least 2.
+         Each overlap is counted once, by the run of the first direction through it,
+         so for a run in one direction only the points where it crosses the runs of
+         the other directions need to be looked at
+            covered by the runs of an earlier direction     counted already
+            otherwise, if the run's count is 2 or more      an overlap
+            otherwise, if covered by a later direction      an overlap
+    """
+    directions = (HORIZONTAL, VERTICAL) + (DIAGONALS if include_diagonal else ())
+    
+    # the [start, end] intervals of the lines, by direction and key
+    intervals = {direction: {} for direction in directions}
+    for line in lines:
+        xy_data = is_valid(line, include_diagonal=include_diagonal)
+        if not xy_data:
+            continue
+        (x0, increment_x), (y0, increment_y), line_range = xy_data
+        x1 = x0 + increment_x * line_range
+        y1 = y0 + increment_y * line_range
+        # go left to right (or top to bottom), a single point is a horizontal line
+        if (x1, y1) < (x0, y0):
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        direction = (int(x1 != x0), (y1 > y0) - (y1 < y0)) if line_range else HORIZONTAL
+        start, end = (x0, x1) if direction[0] else (y0, y1)
+        intervals[direction].setdefault(line_key(direction, x0, y0), []).append((start, end))
+    
+    coverage = {direction: {key: Coverage(spans) for key, spans in intervals[direction].items()}
+                for direction in directions}
+    keys = {direction: sorted(coverage[direction]) for direction in directions}
+    
+    overlaps = 0
+    for d, direction in enumerate(directions):
+        for key, runs in coverage[direction].items():
+            for start, end, count in runs.runs():
+                # the positions along the run covered by the earlier and by the later directions
+                earlier = set()
+                later = set()
+                for other in directions:
+                    if other == direction:
+                        continue
+                    crossed = earlier if directions.index(other) < d else later
+                    # the other direction's key changes by step for each step along the run
+                    first_key = line_key(other, *line_point(direction, key, start))
+                    step = line_key(other, *line_point(direction, key, start+1)) - first_key
+                    last_key = first_key + step * (end - start)
+                    low, high = min(first_key, last_key), max(first_key, last_key)
+                    other_keys = keys[other]
+                    for other_key in other_keys[bisect_left(other_keys, low):bisect_right(other_keys, high)]:
+                        steps, off_point = divmod(other_key - first_key, step)
+                        if off_point:
+                            continue
+                        t = start + steps
+                        x, y = line_point(direction, key, t)
+                        if coverage[other][other_key].count_at(x if other[0] else y):
+                            crossed.add(t)
+                if count >= 2:
+                    overlaps += end - start + 1 - len(earlier)
+                else:
+                    overlaps += len(later - earlier)
+    
+    return overlaps
+
+    
+def add_lines_numpy(lines, include_diagonal, counts):
+    """add the lines to the grid of counts with NumPy array operations
+         the horizontal and vertical lines are counted once (by the first part to run)
+         and shared by both parts, part 2 only adds the diagonal lines to them
+    """
+    view = counts.to_numpy()
+    view += advent.prepared(straight_counts_numpy, lines)
+    
+    if include_diagonal:
+        x0, y0, x1, y1 = advent.prepared(segments_numpy, lines)
+        range_x = abs(x1 - x0)
+        diagonal = (range_x == abs(y1 - y0)) & (range_x > 0)
+        view += rasterize_numpy(x0[diagonal], y0[diagonal], x1[diagonal], y1[diagonal],
+                                view.shape).astype(view.dtype)
+
+
+def segments_numpy(lines):
+    """the lines' end points as four arrays, x0, y0, x1 and y1"""
+    np = advent.np
+    return np.array(lines, dtype=np.int64).reshape(-1, 4).T
+
+
+def straight_counts_numpy(lines):
+    """the counts of the horizontal and vertical lines through each point of the field"""
+    np = advent.np
+    x0, y0, x1, y1 = advent.prepared(segments_numpy, lines)
+    straight = (x0 == x1) | (y0 == y1)
+    shape = (int(max(y0.max(), y1.max())) + 1, int(max(x0.max(), x1.max())) + 1)
+    return rasterize_numpy(x0[straight], y0[straight], x1[straight], y1[straight],
+                           shape).astype(np.uint16)
+
+
+def rasterize_numpy(x0, y0, x1, y1, shape):
+    """count how many of the lines go through each point of a field of the given shape
+         (the lines must be horizontal, vertical or diagonal)
+    """
+    np = advent.np
+    height, width = shape
+    
+    # every point of every line: each line's start plus n steps of its increment
+    points = np.maximum(abs(x1 - x0), abs(y1 - y0)) + 1
+    line_of = np.repeat(np.arange(len(points)), points)
+    n = np.arange(points.sum()) - np.repeat(np.cumsum(points) - points, points)
+    xs = x0[line_of] + np.sign(x1 - x0)[line_of] * n
+    ys = y0[line_of] + np.sign(y1 - y0)[line_of] * n
+    
+    # count how many lines go through each point (as a 2D histogram of the flat indices)
+    return np.bincount(ys * width + xs, minlength=height * width).reshape(shape)
+
+
 def prepare_input_list(lines):
     """convert the input lines into a list of line points"""
     lines_ints = []
@@ -119,6 +331,8 @@ def is_valid(line, include_diagonal=False):
     # steps in x and y direction
     increment_x = 0
     increment_y = 0
+    # (a line that is a single point has a length of 0)
+    line_range = 0
     
     # compute the increment (-1, 0, or +1) for x and y
     # set the 'length' of the line
@@ -13,6 +13,8 @@ description = ("Calculate Lanternfish after 80 days",        # part 1
 #   them up to be able to be executed in a batch with more puzzles.  You can ignore
 #   that.  
 
+from operator import mul
+
 
 def puzzle_part1(lines):
     """run  part1 of puzzle"""
@@ -20,6 +22,7 @@ def puzzle_part1(lines):
     total_fish = fish_descendants(lines[0], 80)
         
     print(f"total fish after  80 days {total_fish}")
+    return total_fish
 
 
 def puzzle_part2(lines):
@@ -28,49 +31,101 @@ def puzzle_part2(lines):
     total_fish = fish_descendants(lines[0], 256)
         
     print(f"total fish after 256 days {total_fish}")
+    return total_fish
         
-def fish_descendants(fish_string, days):
+# for a given spawn_time, spawn_update gives the spawn_time value(s) for the next day
+#   spawn time    0     1    2    3    4    5    6    7    8
+SPAWN_UPDATES = ((6,8),(0,),(1,),(2,),(3,),(4,),(5,),(6,),(7,))
+
+# the number of fish after more days than this is too big to compute exactly (it has
+# tens of thousands of digits), only the number modulo a modulus can be computed
+MAX_EXACT_DAYS = 10**6
+
+# the squares of the transition matrix (see fish_populations) computed so far, by modulus
+transition_squares = {}
+
+
+def fish_descendants(fish_string, days, modulus=None):
     """compute number of fish after 'days' """
+    
+    return fish_populations(fish_string, [days], modulus)[days]
+
+
+def fish_populations(fish_string, days_list, modulus=None):
+    """compute the number of fish after each of the numbers of days in days_list
+         returns a dictionary of days: number of fish
+         
+         a day's update is a linear function of the counts of the fish of each spawn
+         time, a 9x9 transition matrix T (built from SPAWN_UPDATES), so the counts after
+         'days' days are T**days times the initial counts.  T**days is the product of
+         the squares T, T**2, T**4, T**8 ... for the bits set in days, so each number of
+         days takes O(log days) steps, and the squares are kept for all later calls
+         
+         the number of fish grows by about 9% a day (it has about days/26 digits), so
+         for more than MAX_EXACT_DAYS days (10**12 say) only the number of fish modulo
+         'modulus' can be computed, a ValueError is raised if no modulus is given
+    """
     # convert the single input line into a list of integers, one for each fish, and which 
     # contain the time (in days) until the fish will spawn
     initial_fish = [int(fish) for fish in fish_string.split(',')]
     
-    # current_fish will contain the count of how many fish exist of each possible spawn time
-    current_fish = [0] * 9
+    # initial_counts will contain the count of how many fish exist of each possible spawn time
+    initial_counts = [0] * 9
     for fish in initial_fish:
-        current_fish[fish] += 1
-    
-    # for a given spawn_time, spawn_update gives the spawn_time value(s) for the next day
-    #   spawn time    0     1    2    3    4    5    6    7    8
-    spawn_updates = ((6,8),(0,),(1,),(2,),(3,),(4,),(5,),(6,),(7,))
+        initial_counts[fish] += 1
     
-    # update current_fish to contain the number of fish of each spawn_time after the number of days specified
-    for _ in range(days):
-        # each day we build a new list with counts of the fish of each possible spawn time (0 - 8)
-        next_fish = [0] * 9
-        # current_fish contains 9 entries, one for each possible spawn time (0 - 8)
-        # the values of these 9 entries contain the number of fish that currently exist
-        # with that spawn time.
-        
-        # spawn_updates contains 9 entries, one for each possible spawn time (0 - 8)
-        # the values of these 9 entries contain the spawn times for the next day
-        
-        # for each of those counts we determine what the next spawn time will be (current-1 for spawn times 
-        # greater than 0, and 6 for a spawn time of 0) and move those counts to the new spawn time in next_fish.
-        # Also, in the case of current==0, we add the count of fish to spawn time of 8, representing the
-        # newly spawned fish.
-        # 
-        for updates, fish in zip(spawn_updates, current_fish):
-            for i in updates:
-                next_fish[i] += fish
-        # make the next list become the current list
-        current_fish = next_fish
-    
-    # return the total number of fish
-    return sum(current_fish)
+    # squares[k] is the transition matrix for 2**k days
+    squares = transition_squares.setdefault(modulus, [transition_matrix()])
+    populations = {}
+    for days in days_list:
+        if days < 0:
+            raise ValueError(f"the number of days must not be negative, not {days}")
+        if days > MAX_EXACT_DAYS and not modulus:
+            raise ValueError(f"the number of fish after {days} days is too big to compute, "
+                             f"more than {MAX_EXACT_DAYS} days needs a modulus")
+        counts = initial_counts
+        bit = 0
+        while days >> bit:
+            if bit == len(squares):
+                squares.append(multiply_matrices(squares[-1], squares[-1], modulus))
+            if (days >> bit) & 1:
+                counts = multiply_vector(squares[bit], counts, modulus)
+            bit += 1
+        # the total number of fish
+        total = sum(counts)
+        populations[days] = total % modulus if modulus else total
     
+    return populations
+
+
+def transition_matrix():
+    """the matrix for one day's update, next_fish = matrix times current_fish
+         matrix[new][old] is 1 if the fish with spawn time old have spawn time new
+         the next day
+    """
+    matrix = [[0] * 9 for _ in range(9)]
+    for old, updates in enumerate(SPAWN_UPDATES):
+        for new in updates:
+            matrix[new][old] += 1
+    return matrix
+
+
+def multiply_matrices(a, b, modulus=None):
+    """the product of two square matrices (lists of rows), optionally modulo modulus"""
+    columns = list(zip(*b))
+    product = [[sum(map(mul, row, column)) for column in columns] for row in a]
+    if modulus:
+        product = [[value % modulus for value in row] for row in product]
+    return product
+
+
+def multiply_vector(matrix, vector, modulus=None):
+    """the product of a matrix and a vector, optionally modulo modulus"""
+    product = [sum(map(mul, row, vector)) for row in matrix]
+    if modulus:
+        product = [value % modulus for value in product]
+    return product
     
- 
     
 # import code common for all Advent puzzles
 import advent 
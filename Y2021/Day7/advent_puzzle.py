@@ -20,6 +20,8 @@ def puzzle_part1(lines):
     min_fuel_pos, min_fuel = optimize_crab_fuel(lines[0], puzzle_part=1)
     
     print(f'minimum fuel position={min_fuel_pos}, fuel used={min_fuel}')
+    advent.diagnostic('position', min_fuel_pos)
+    return min_fuel
        
     
 def puzzle_part2(lines):
@@ -28,6 +30,8 @@ def puzzle_part2(lines):
     min_fuel_pos, min_fuel = optimize_crab_fuel(lines[0], puzzle_part=2)
             
     print(f'minimum fuel position={min_fuel_pos}, fuel used={min_fuel}')
+    advent.diagnostic('position', min_fuel_pos)
+    return min_fuel
 
 
 def optimize_crab_fuel(crabs_line, puzzle_part):
@@ -32,6 +32,7 @@ def puzzle_part1(lines):
     unique_counts = segments[2] + segments[4] + segments[3] + segments[7]
     
     print(f"count of outputs for 1, 4, 7, and 8  is  {unique_counts}")
+    return unique_counts
     
     
 def puzzle_part2(lines):
@@ -141,6 +142,7 @@ def puzzle_part2(lines):
         overall_sum += val
         
     print(f"overall sum = {overall_sum}")
+    return overall_sum
         
 def prepare_input_list(lines):
     return list(lines)
@@ -148,5 +150,5 @@ def prepare_input_list(lines):
 # import code common for all Advent puzzles
 import advent 
 # pass module name, and package
-advent.startup(__name__, __package__)
+advent.startup(__name__, __package__, stream=True)
 
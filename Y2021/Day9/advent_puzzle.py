@@ -14,46 +14,57 @@ description = ( "Find all low points in the map and calculate the sum of the ris
 #   them up to be able to be executed in a batch with more puzzles.  You can ignore
 #   that.  
 
+import grid
+
 class AdventPuzzle():
     def __init__(self, lines):
         """initialize the AdventPuzzle object"""
         self.grid = self.prepare_input_list(lines)
-        self.y_size = len(self.grid)
-        self.x_size = len(self.grid[0])
+        self.y_size = self.grid.height
+        self.x_size = self.grid.width
+        
+        # flat index offsets of the four neighbors of a point
+        self.deltas = self.grid.offsets(grid.ORTHOGONAL)
         
-        # iterate over the grid and find all of the 'low points'
-        # marked_grid will have True where there is a low point, otherwise False
-        self.low_points_grid = self.mark_low_points()
+        # the 'low points' are found by the first part that needs them (see find_low_points)
+        self.low_points_grid = None
+
+    def find_low_points(self):
+        """iterate over the grid and find all of the 'low points' (only once, both parts use them)
+             low_points_grid will have 1 where there is a low point, otherwise 0
+        """
+        if self.low_points_grid is None:
+            self.low_points_grid = self.mark_low_points()
 
     def puzzle_part1(self):
         """run  part1 of puzzle"""
         
+        self.find_low_points()
+        
         # compute sum of the risk values
         # risk value is low_point value + 1
         total_risk = 0
-        for y, row in enumerate(self.low_points_grid):
-            for x, low_point in enumerate(row):
-                if low_point:
-                    total_risk += self.grid[y][x] + 1
+        for i in self.low_points:
+            total_risk += self.grid.cells[i] + 1
         
         # if the grid is small, show the low points
         if self.x_size < 20:
             self.print_grid(self.low_points_grid)
             
         print(f"total risk is {total_risk}")
+        return total_risk
     
     def puzzle_part2(self):
         """run part2 of puzzle"""
         
+        self.find_low_points()
+        
         # list of the basin sizes
-        basin_sizes = []
-        
-        # iterate over the low points grid, and for each low point compute the basin around it
-        for y, row in enumerate(self.low_points_grid):
-            for x, low_point in enumerate(row):
-                if low_point:
-                    # point x,y is a low point, compute the basin around it
-                    basin_sizes.append(self.compute_basin((x,y)))
+        # for each low point compute the basin around it
+        if advent.use_numpy():
+            basin_sizes = self.basin_sizes_numpy()
+        else:
+            basin_sizes = [self.compute_basin(i) for i in self.low_points]
                     
         basin_sizes.sort(reverse=True)
         print(f"3 biggest basins are {basin_sizes[:3]}")
@@ -63,80 +74,115 @@ class AdventPuzzle():
         for basin_size in basin_sizes[:3]:
             product *= basin_size
         print(f"product of biggesst 3 basin sizes is {product}")
+        return product
 
 
     @staticmethod
     def prepare_input_list(lines):
-        """create a list of lists of the input"""
-        return [[int(val) for val in list(line)] for line in lines]
+        """create a grid of the input
+             the grid has a border of 9's, so a point's neighbors never need to be bounds
+             checked (a 9 is never lower than a point, and is never part of a basin)
+        """
+        return grid.Grid.from_rows([[int(val) for val in line] for line in lines], pad=1, border=9)
     
     
     def print_grid(self, marked_grid):
         """print the grid, highlighting the marked points"""
+        if not advent.showing():
+            return
         if marked_grid:
-            for line, marks in zip(self.grid, marked_grid):
+            for line, marks in zip(self.grid.rows(), marked_grid.rows()):
                 for val, mark in zip(line, marks):
                     mark = advent.BRIGHT if mark else advent.DIM
                     print(f"{mark}{val}{advent.NORMAL}", end='')
                 print()
             print()
         else:
-            for line in self.grid:
+            for line in self.grid.rows():
                 for val in line:
                     print(f"{val}", end='')
                 print()
             print()
             
-            
-    deltas = ((-1,0), (+1,0), (0,-1), (0,+1))
 
     def mark_low_points(self):
         """build a marked_grid identifying the low points of the grid"""
-        max_y = self.y_size-1
-        max_x = self.x_size-1
-        # intialize a marked_grid to all True 
-        # in the loop below will will mark everything False that is not a low point
-        low_points_grid = self.make_marked_grid(init_value=True)
-        
-        for y, row in enumerate(self.grid):
-            for x, val_xy in enumerate(row):
-                # for each x,y point, find if it is lower than its four neighbors
-                #  AdvemtPuzzles.deltas contains the offsets for each of the four neighbors
-                #  make sure that the neighbor is acutally in the grid
-                for dx, dy in AdventPuzzle.deltas:
-                    xp, yp = x+dx, y+dy
-                    if (0 <= xp < self.x_size) and            \
-                       (0 <= yp < self.y_size) and            \
-                       (self.grid[yp][xp] <= val_xy):
-                        # if the neighbor is less or equal, mark as not a low point
-                        low_points_grid[y][x] = False
+        if advent.use_numpy():
+            return self.mark_low_points_numpy()
+        
+        cells = self.grid.cells
+        low_points_grid = self.make_marked_grid()
+        
+        # for each point, find if it is lower than its four neighbors
+        # (the border of 9's means every neighbor is in the grid)
+        self.low_points = []
+        for i in self.grid.interior():
+            val = cells[i]
+            if all(cells[i+delta] > val for delta in self.deltas):
+                low_points_grid.cells[i] = 1
+                self.low_points.append(i)
                 
         return low_points_grid
 
 
-    def make_marked_grid(self, init_value=False):
-        """build a grid marked with the initial value"""
-        return [[init_value for _ in range(self.x_size)] for _ in range(self.y_size)]
+    def mark_low_points_numpy(self):
+        """build a marked_grid identifying the low points of the grid, with NumPy array operations"""
+        np = advent.np
+        heights = self.grid.to_numpy()
+        padded = np.pad(heights, 1, constant_values=9)
+        
+        # a point is a low point if it is lower than all four of its neighbors
+        low = np.ones(heights.shape, dtype=bool)
+        for dx, dy in grid.ORTHOGONAL:
+            low &= heights < padded[1+dy:1+dy+self.y_size, 1+dx:1+dx+self.x_size]
+        
+        low_points_grid = self.make_marked_grid()
+        low_points_grid.to_numpy()[low] = 1
+        self.low_points = [self.grid.index(x, y) for y, x in zip(*np.nonzero(low))]
+        return low_points_grid
+
+
+    def basin_sizes_numpy(self):
+        """compute the sizes of all of the basins with NumPy array operations"""
+        np = advent.np
+        in_basin = self.grid.to_numpy() != 9
+        
+        # give each low point its own label, then spread the labels to their neighbors
+        # until they fill the basins (the basins are separated by 9's)
+        labels = np.zeros((self.y_size, self.x_size), dtype=np.int64)
+        labels[self.low_points_grid.to_numpy() == 1] = np.arange(1, len(self.low_points)+1)
+        while True:
+            padded = np.pad(labels, 1)
+            spread = labels.copy()
+            for dx, dy in grid.ORTHOGONAL:
+                spread = np.maximum(spread, padded[1+dy:1+dy+self.y_size, 1+dx:1+dx+self.x_size])
+            spread[~in_basin] = 0
+            if np.array_equal(spread, labels):
+                break
+            labels = spread
+        
+        # the size of a basin is the number of points with its label
+        return np.bincount(labels.ravel(), minlength=len(self.low_points)+1)[1:].tolist()
+
+
+    def make_marked_grid(self):
+        """build a grid (the same shape as the puzzle's grid) of unmarked points"""
+        return grid.Grid(self.x_size, self.y_size, pad=1)
     
 
     def compute_basin(self, low_point):
         """compute the size of the basin around the low point"""
-        x, y = low_point
         
         # make a grid to keep track of the basin's points
-        basin_grid = self.make_marked_grid(init_value=False)
+        basin_grid = self.make_marked_grid()
         
         # add the low point to the basin
-        #  this will recursively add all of the points
+        #  this will add all of the points
         #  which are within the basin
-        self.add_to_basin((x,y), basin_grid)
+        self.add_to_basin(low_point, basin_grid)
         
         # now compute size of the basin
-        basin_size = 0
-        for row in basin_grid:
-            for basin_point in row:
-                if basin_point:
-                    basin_size += 1
+        basin_size = basin_grid.count(1)
         
         # if the grid is small, show the basin
         if self.x_size < 20:            
@@ -145,32 +191,22 @@ class AdventPuzzle():
         return basin_size
 
 
-    def add_to_basin(self, xy, basin_grid):
-        """add a point, and (recursively) its neighbors, to the basin"""
-        x, y = xy
-        
-        # add the point at x,y to the basin
-        basin_grid[y][x] = True
-        
-        # try to add the points in the 4 directions from this point
-        #  points beyond the edges of the grid are ignored
-        for dx, dy in AdventPuzzle.deltas:
-            self.try_add_to_basin((x+dx,y+dy), basin_grid)
-
-
-    def try_add_to_basin(self, xy, basin_grid):
-        """test if the specified point can be added to the basin
-           and add it if it can be
-        """
-        x, y = xy
-        # if the point is within the grid
-        #   and it is not already in the basin
-        #   and its value is not 9 (9's are not in basins)
-        if 0 <= x < self.x_size and         \
-           0 <= y < self.y_size and         \
-           not basin_grid[y][x] and         \
-           self.grid[y][x] != 9 :
-            self.add_to_basin(xy, basin_grid)
+    def add_to_basin(self, low_point, basin_grid):
+        """add a point, and its neighbors (and their neighbors ...), to the basin"""
+        cells = self.grid.cells
+        basin = basin_grid.cells
+        basin[low_point] = 1
+        to_visit = [low_point]
+        while to_visit:
+            i = to_visit.pop()
+            # try to add the points in the 4 directions from this point
+            # points that are already in the basin, and 9's (including the
+            # border) are not added
+            for delta in self.deltas:
+                point = i + delta
+                if not basin[point] and cells[point] != 9:
+                    basin[point] = 1
+                    to_visit.append(point)
     
     
 # import code common for all Advent puzzles
@@ -37,6 +37,7 @@ def puzzle_part1(lines):
         print_grid(grid, low_points_grid)
         
     print(f"total risk is {total_risk}")
+    return total_risk
     
 
 def puzzle_part2(lines):
@@ -70,6 +71,7 @@ def puzzle_part2(lines):
     for basin_size in biggest_basins:
         product *= basin_size
     print(f"product of biggesst 3 basin sizes is {product}")
+    return product
 
 
 def mark_low_points(grid):
@@ -99,6 +101,8 @@ def prepare_input_list(lines):
 
 def print_grid(grid, marked_grid):
     """print the grid, highlighting the marked points"""
+    if not advent.showing():
+        return
     for line, marks in zip(grid, marked_grid):
         for val, mark in zip(line, marks):
             mark = advent.BRIGHT if mark else advent.DIM
@@ -0,0 +1,161 @@
+import time
+import resource
+import sys
+
+# TimingManager is a context manager used to time a block of code
+#
+#   import TimingManager as tm
+#
+#   with tm.TimingManager('Day15 Part1', elapsedOnly=True):
+#       ...code to be timed...
+#
+# for each block it records the elapsed (wall clock) time, the cpu time and
+# the peak resident set size (RSS) of the process.  TimingManager blocks can be
+# nested, each record remembers its parent and its depth so a report can be
+# indented to show the nesting.
+#
+# every completed block is added to the module's registry (a list of Timing
+# records) so that other tools (test_all.py, for example) can query the results
+# instead of only having them printed
+
+
+class Timing():
+    """the measurements recorded for one timed block"""
+    def __init__(self, name, parent=None, depth=0):
+        self.name = name
+        self.parent = parent
+        self.depth = depth
+        self.elapsed = None
+        self.cpu = None
+        self.peak_rss = None
+        self.rss_growth = None
+
+    def path(self):
+        """the names of this block and all of the blocks that enclose it, joined by '/' """
+        if self.parent is None:
+            return self.name
+        return self.parent.path() + '/' + self.name
+
+    def as_dict(self):
+        """return the record as a dictionary (for json)"""
+        return {'name': self.name, 'path': self.path(), 'depth': self.depth,
+                'elapsed': self.elapsed, 'cpu': self.cpu,
+                'peak_rss': self.peak_rss, 'rss_growth': self.rss_growth}
+
+    def __str__(self):
+        return (f"{self.name}: elapsed {format_seconds(self.elapsed)}, cpu {format_seconds(self.cpu)}, "
+                f"peak rss {format_bytes(self.peak_rss)} (+{format_bytes(self.rss_growth)})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# the registry of completed Timing records, in the order they completed
+timings = []
+
+# the stack of Timing records for the blocks currently being timed
+active = []
+
+
+class TimingManager():
+    """context manager to time a block of code"""
+    def __init__(self, name, elapsedOnly=False, report=True):
+        """elapsedOnly prints just the elapsed time, report=False prints nothing"""
+        self.name = name
+        self.elapsedOnly = elapsedOnly
+        self.report = report
+        self.timing = None
+
+    def __enter__(self):
+        parent = active[-1] if active else None
+        self.timing = Timing(self.name, parent, len(active))
+        active.append(self.timing)
+        self.start_rss = peak_rss()
+        self.start_cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self.timing
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        cpu = time.process_time() - self.start_cpu
+
+        timing = self.timing
+        timing.elapsed = elapsed
+        timing.cpu = cpu
+        timing.peak_rss = peak_rss()
+        timing.rss_growth = timing.peak_rss - self.start_rss
+
+        # remove this block from the active stack and add it to the registry
+        active.remove(timing)
+        timings.append(timing)
+
+        if self.report:
+            indent = '  ' * timing.depth
+            if self.elapsedOnly:
+                print(f"{indent}{self.name}: elapsed {format_seconds(elapsed)}")
+            else:
+                print(f"{indent}{timing}")
+
+        # do not suppress any exception raised in the block
+        return False
+
+
+def peak_rss():
+    """return the peak resident set size of this process in bytes"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macos reports bytes
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return rss
+
+
+def get_timings(name=None):
+    """return the registered Timing records, optionally only those with a given name"""
+    if name is None:
+        return list(timings)
+    return [timing for timing in timings if timing.name == name]
+
+
+def last_timing(name):
+    """return the most recent Timing record with a given name (or None)"""
+    for timing in reversed(timings):
+        if timing.name == name:
+            return timing
+    return None
+
+
+def clear_timings():
+    """empty the registry"""
+    timings.clear()
+
+
+def print_report(records=None):
+    """print the Timing records (default: the whole registry), indented by nesting depth"""
+    if records is None:
+        records = timings
+    # records are registered when they complete, so an enclosing block
+    # is listed after the blocks it contains
+    for timing in records:
+        print(f"{'  ' * timing.depth}{timing}")
+
+
+def format_seconds(seconds):
+    """format a time in seconds with appropriate units"""
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def format_bytes(size):
+    """format a size in bytes with appropriate units"""
+    if size is None:
+        return '-'
+    for units in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f}{units}" if units == 'B' else f"{size:.1f}{units}"
+        size /= 1024
+    return f"{size:.1f}GB"
@@ -1,13 +1,63 @@
 
 import sys
 import os
+import io
+import time
+import importlib
+import contextlib
+import TimingManager as tm
+
+# the modules only needed by the batch, profile and answer cache modes (multiprocessing,
+# cProfile, sqlite3, json ...) are imported by the functions that use them, so that importing
+# advent (every run of every day) stays fast
+
+# NumPy is optional, it is only needed for the 'numpy' backend (see use_numpy).  It is
+# imported the first time the numpy backend is used (load_numpy), np is None until then
+np = None
+numpy_missing = False
 
 # ANSI control codes for highlighting marked and unmarked locations 
 NORMAL = '\x1b[0m'  # for everything except the grid's locations
 BRIGHT = '\x1b[1m'  # for 'marked' locations
 DIM =    '\x1b[2m'  # for 'unmarked' locations
 
-def startup(my_name, my_package, obj=False):
+# verbosity levels
+#   QUIET   grids, paths, packet trees and progress messages are not rendered at all
+#           (the renderers return before doing any formatting), only the answers are printed
+#   VERBOSE everything is printed
+QUIET = 0
+VERBOSE = 1
+
+verbosity = VERBOSE
+
+def showing(level=VERBOSE):
+    """True if output at this verbosity level should be rendered"""
+    return verbosity >= level
+
+# compute backends
+#   'python'  the puzzles' pure python code
+#   'numpy'   the grid puzzles (Day5, Day9, Day11, Day13, Day20, Day25) and Day1 use NumPy
+#             array operations instead.  If NumPy is not installed the python code is used
+BACKENDS = ('python', 'numpy')
+
+backend = 'python'
+
+def use_numpy():
+    """True if the puzzles should use their NumPy code"""
+    return backend == 'numpy' and load_numpy() is not None
+
+def load_numpy():
+    """import NumPy (only the first call imports it), return it or None if it is not installed"""
+    global np, numpy_missing
+    if np is None and not numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            numpy_missing = True
+    return np
+
+def startup(my_name, my_package, obj=False, stream=False):
     if my_package == None:
         my_file_prefix = ''
     else:
@@ -32,79 +82,551 @@ def startup(my_name, my_package, obj=False):
         #   or, if not specified, 'input.txt' will be looked for in .../mydir/
         #   if 'input.txt' is not found then it will look for 'sample.txt'
         
-        input_file = None
-        # if filename specified on the command line
-        if len(sys.argv) > 1:
-            input_file = my_file_prefix+sys.argv[1]
-            
-        # otherwise use 'input.txt' if it exists, if not try 'sample.txt'
-        else:
-            input_txt = my_file_prefix+'input.txt'
-            sample_txt = my_file_prefix+'sample.txt'
-            
-            if os.path.isfile(input_txt):
-                input_file = input_txt
-                
-            elif os.path.isfile(sample_txt):
-                input_file = sample_txt
-                
-        if input_file is None:
+        # more than one input file can be given, with several names, globs (quote them) or
+        # directories (all of the input files in the directory), for example
+        #   .../Y2021 > python3 -m Day12.advent_puzzle 'sample*.txt'
+        #   .../Y2021 > python3 -m Day15.advent_puzzle generated -j 4
+        # the files are run in a pool of worker processes (-j, default is the number of
+        # cores) and one line is printed for each file, with its answers and timings
+        
+        input_files, options, workers = command_line(my_file_prefix)
+        if not input_files:
             print("No input file found")
             exit()
         
-        
         # run the part1 and part2 puzzle code
-        # sys.modules[my_name].puzzle(input_file, part='both')
-        puzzle(input_file, part='both', obj=obj)
+        if len(input_files) > 1:
+            failures = run_batch(sys.modules[my_name], input_files, obj=obj, stream=stream, workers=workers, **options)
+            # a failed file fails the run, for scripts checking many inputs
+            if failures:
+                sys.exit(1)
+        else:
+            puzzle(input_files[0], part='both', obj=obj, module=sys.modules[my_name], stream=stream, **options)
         
+    # otherwise the module was imported (by test_all.py or registry.py, see registry.py)
+    # and importing it does nothing, the importer runs it with puzzle()
+
+
+def command_line(my_file_prefix, args=None):
+    """parse the command line of a single day run (default sys.argv[1:])
+         returns the input files (an empty list if there are none), the options
+         for puzzle (cache, backend and profile) and the number of workers
+    """
+    global verbosity
+    if args is None:
+        args = sys.argv[1:]
+    args = list(args)
+    
+    # -q or --quiet on the command line turns off the rendering of grids, paths, etc.
+    for quiet in ('-q', '--quiet'):
+        while quiet in args:
+            args.remove(quiet)
+            verbosity = QUIET
+    
+    # -c or --cache on the command line uses the answer cache (see puzzle)
+    cache = False
+    for cache_arg in ('-c', '--cache'):
+        while cache_arg in args:
+            args.remove(cache_arg)
+            cache = True
+    
+    # --numpy on the command line selects the numpy backend
+    backend = None
+    while '--numpy' in args:
+        args.remove('--numpy')
+        backend = 'numpy'
+    
+    # --profile on the command line profiles each part (see puzzle)
+    profile = 0
+    while '--profile' in args:
+        args.remove('--profile')
+        profile = PROFILE_TOP
+    
+    # -j N (or --workers N) sets the number of worker processes for several input files
+    workers = None
+    for workers_arg in ('-j', '--workers'):
+        while workers_arg in args:
+            at = args.index(workers_arg)
+            workers = int(args[at+1])
+            del args[at:at+2]
+    
+    input_files = []
+    # if filenames (or globs, or directories) specified on the command line
+    if len(args) > 0:
+        input_files = expand_inputs(my_file_prefix, args)
+        
+    # otherwise use 'input.txt' if it exists, if not try 'sample.txt'
     else:
-        # advent_puzzle was imported into test_all.py
-        # test_all.py imports multiple advent_puzzle files (perhaps from multiple days)
-        # and runs them all
+        input_txt = my_file_prefix+'input.txt'
+        sample_txt = my_file_prefix+'sample.txt'
         
-        # test_all.py invoked via:  .../2021 > python3 -m Day1.advent_puzzle
-        # (note: -m and the name ... Day1.advent_puzzle  NOT  Day1/advent_puzzle.py)
+        if os.path.isfile(input_txt):
+            input_files = [input_txt]
+            
+        elif os.path.isfile(sample_txt):
+            input_files = [sample_txt]
+            
+    return input_files, {'cache': cache, 'backend': backend, 'profile': profile}, workers
+
+
+def expand_inputs(my_file_prefix, names):
+    """the input files for the names given on the command line
+         a name can be a file, a glob or a directory (all of the input files in it, the
+         .txt files).  Golden results files are left out of globs and directories
+    """
+    import glob
+    input_files = []
+    for name in names:
+        path = os.path.normpath(my_file_prefix+name)
+        if os.path.isdir(path):
+            input_files += sorted(os.path.join(path, file_name) for file_name in os.listdir(path)
+                                  if file_name.endswith('.txt') and 'results' not in file_name)
+        elif glob.has_magic(path):
+            input_files += sorted(file_name for file_name in glob.glob(path)
+                                  if 'results' not in os.path.basename(file_name))
+        else:
+            # a missing file is left in, it fails when it is run
+            input_files.append(path)
+    return input_files
+
+
+class PartResult():
+    """the result of running one part of a puzzle"""
+    def __init__(self, part, answer=None):
+        self.part = part
+        self.answer = answer        # the value returned by puzzle_part1 or puzzle_part2
+        self.elapsed = None         # elapsed time (seconds)
+        self.cpu = None             # cpu time (seconds)
+        self.output = None          # the output of the part (when it is not echoed)
+        self.diagnostics = {}       # anything recorded by diagnostic()
+        self.cached = False         # True if the result came from the answer cache
+        self.profile = None         # the hot spots of the part (see profiling), when profiled
     
-        main = sys.modules['__main__']          # get a reference to the test driver module
-        myself = sys.modules[my_name]           # get a reference to this module
-        main.mod_list.append([myself, my_package])  # add myself to the list of modules to be tested
+    def __repr__(self):
+        return f"PartResult(part={self.part}, answer={self.answer!r}, elapsed={self.elapsed})"
 
 
-def puzzle(input_file, part='both', obj=False):
+# the PartResult for the part that is currently running (used by diagnostic)
+current_result = None
+
+# the key (see input_key) of the input file being run (used by prepared)
+current_input = None
+
+
+def puzzle(input_file, part='both', obj=False, module=None, echo=True, cache=False, backend=None, stream=False,
+           profile=0):
     """run part1 and part2 of the puzzle
          parameters are the input file name, and a parameter that
          can be 1 to execute only Part1, 2 to execute only Part2 or 'both' to execute both parts
+         
+         module is the advent_puzzle module to run (advent.startup passes the day's
+         own module, test_all.py and registry.py the module they loaded, see registry.py)
+         if echo is False nothing is printed, the output of each part is
+         captured in its PartResult instead
+         
+         if cache is True the answer cache (see load_answers) is used, if the input file
+         and the module's source are unchanged since the last run the cached results
+         (answers, timings and output) are returned without running the puzzle at all
+         
+         backend selects the compute backend ('python' or 'numpy', see BACKENDS), the
+         default is to keep the current one
+         
+         if stream is True (function style days only) each part is passed a generator
+         of the lines (see stream_input) instead of a list, the input is never held in
+         memory.  The lines are the same text lines either way (the day converts them)
+         
+         if profile is not 0 each part is run under cProfile and tracemalloc, and the top
+         'profile' functions (by cumulative time) and allocation sites are printed.  They
+         are also saved, next to the day's results.txt, as <input>_part1.pstats (for pstats
+         or snakeviz) and <input>_profile.json (see save_profile).  The answer cache is not
+         used, and the timings include the profiler's overhead
+         
+         returns a dictionary with a PartResult for each part that was run
+         each part is timed with TimingManager as '<module name> Part1' and '<module name> Part2'
+         (and reading the input and the constructor as '<module name> Input' and '<module name> Init')
     """
-    main = sys.modules['__main__']
+    if module is None:
+        raise TypeError("puzzle() needs the module to run")
+    
+    # (the parameter hides the global backend)
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+        globals()['backend'] = backend
+    
+    # a profiled run always runs the parts
+    if profile:
+        cache = False
+    
+    cached = None
+    if cache:
+        key = answer_key(input_file, module, part)
+        cached = load_answers(module, key)
+    
+    if stream and obj:
+        raise ValueError("only function style puzzles can stream their input")
     
     # read the input lines, convert them to integers and put them in a list of lines
-    lines = read_input(input_file)
+    # (a streaming puzzle reads them itself, as it goes)
+    # reading the input and constructing the AdventPuzzle are timed (as '<module name> Input'
+    # and '<module name> Init') separately from the parts, see test_all.py --startup
+    with tm.TimingManager(f"{module.__name__} Input", report=False):
+        lines = None if stream else read_input(input_file)
     
-    if obj:
-        puzzle_object = sys.modules['__main__'].AdventPuzzle(lines)
+    def part_lines():
+        """the lines for one part: a new stream of them, or a copy of the list (some puzzles consume it)"""
+        if stream:
+            return read_input(input_file, stream=True)
+        return list(lines)
     
-    if part != 'both':
-        print('-'*80)
-    print(f"{len(lines)} Lines read from {input_file}")
-    print('-'*80)
+    # prepared() caches the parsed input under this input file (and input_file_name
+    # returns it) while the puzzle runs, it is cleared when the puzzle returns
+    global current_input
+    current_input = input_key(input_file)
+    try:
+        results = {}
+        # output from the constructor and the headers is only wanted when echoing
+        with echo_output(echo):
+            # the constructor is not needed if the answers are cached (it is slow for some days)
+            if obj and cached is None:
+                with tm.TimingManager(f"{module.__name__} Init", report=False):
+                    puzzle_object = module.AdventPuzzle(lines)
+        
+            if part != 'both':
+                print('-'*80)
+            if stream:
+                print(f"Streaming lines from {input_file}")
+            else:
+                print(f"{len(lines)} Lines read from {input_file}")
+            if globals()['backend'] == 'numpy' and load_numpy() is None:
+                print("NumPy is not installed, using the python code")
+            print('-'*80)
     
-    if part == 1 or part == 'both':
-        print_description(main.description[0], part=1)
-        if obj:
-            puzzle_object.puzzle_part1()
-        else:
-            sys.modules['__main__'].puzzle_part1(list(lines))
+        if part == 1 or part == 'both':
+            with echo_output(echo):
+                print_description(module.description[0], part=1)
+            if cached is not None:
+                results[1] = cached_part(cached[1], echo)
+            else:
+                if obj:
+                    part_function = puzzle_object.puzzle_part1
+                else:
+                    part_function = lambda: module.puzzle_part1(part_lines())
+                results[1] = run_part(module, 1, part_function, echo, capture=cache,
+                                      profile=profile, stats_file=profile_file(module, input_file, 'part1.pstats'))
         
-    if part == 'both':
-        print('-'*80)
+        if part == 'both':
+            with echo_output(echo):
+                print('-'*80)
     
-    if part == 2 or part == 'both':
-        print_description(main.description[1], part=2)
-        if obj:
-            puzzle_object.puzzle_part2()
-        else:
-            sys.modules['__main__'].puzzle_part2(list(lines))
+        if part == 2 or part == 'both':
+            with echo_output(echo):
+                print_description(module.description[1], part=2)
+            if cached is not None:
+                results[2] = cached_part(cached[2], echo)
+            else:
+                if obj:
+                    part_function = puzzle_object.puzzle_part2
+                else:
+                    part_function = lambda: module.puzzle_part2(part_lines())
+                results[2] = run_part(module, 2, part_function, echo, capture=cache,
+                                      profile=profile, stats_file=profile_file(module, input_file, 'part2.pstats'))
+    
+        if cache and cached is None:
+            save_answers(module, key, results)
+    
+        if profile:
+            save_profile(profile_file(module, input_file, 'profile.json'), module, input_file, results)
+        
+        return results
+    finally:
+        current_input = None
+        
+        
+def run_batch(module, input_files, obj=False, stream=False, workers=None, cache=False, backend=None, profile=0):
+    """run the puzzle on several input files in a pool of worker processes
+         a line is printed for each file when it completes (in completion order), with
+         the answers and elapsed times of both parts.  Returns the number of input files
+         that failed
+    """
+    # the workers import the module themselves, by name
+    if module.__spec__ is not None:
+        module_name = module.__spec__.name
+    else:
+        module_name = os.path.splitext(os.path.basename(module.__file__))[0]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    print(f"running {module_name} on {len(input_files)} input files, {workers} workers")
+    print('-'*80)
+    start = time.perf_counter()
+    results = {}
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    # each file gets a fresh worker process, some days keep state in classes
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_file, module_name, input_file, obj, stream, cache, backend, profile)
+                   for input_file in input_files]
+        for future in as_completed(futures):
+            input_file, part_results, error, elapsed = future.result()
+            results[input_file] = part_results
+            print(batch_line(input_file, part_results, error, elapsed))
+    print('-'*80)
+    failures = sum(1 for part_results in results.values() if part_results is None)
+    print(f"{len(input_files)} files, {failures} failed, wall time {tm.format_seconds(time.perf_counter() - start)}")
+    return failures
+
+
+def run_file(module_name, input_file, obj, stream, cache, backend, profile=0):
+    """run both parts of the puzzle on one input file (in a worker process), without echoing
+         returns the input file, the PartResults (None if it failed), the error and the elapsed time
+    """
+    global verbosity
+    verbosity = QUIET
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+        part_results = puzzle(input_file, part='both', obj=obj, module=module, echo=False,
+                              cache=cache, backend=backend, stream=stream, profile=profile)
+        error = None
+    except Exception:
+        import traceback
+        part_results = None
+        error = traceback.format_exc().rstrip().splitlines()[-1]
+    return input_file, part_results, error, time.perf_counter() - start
+
+
+def batch_line(input_file, part_results, error, elapsed):
+    """the one line summary of a run in a batch"""
+    if part_results is None:
+        return f"{input_file:32s} FAILED  {error}"
+    line = f"{input_file:32s}"
+    for part, result in part_results.items():
+        # multi-line answers (Day13's code) are joined into one line
+        answer = ' / '.join(str(result.answer).splitlines())
+        timing = 'cached' if result.cached else tm.format_seconds(result.elapsed)
+        line += f"  part {part} {answer:>16s} ({timing})"
+    return line + f"  total {tm.format_seconds(elapsed)}"
+
+
+def run_part(module, part, part_function, echo, capture=False, profile=0, stats_file=None):
+    """run one part of the puzzle, and return its PartResult
+         if capture is True the output is captured in the PartResult even when echoing
+         if profile is not 0 the part is profiled (see profiling)
+    """
+    global current_result
+    result = PartResult(part)
+    current_result = result
+    try:
+        with part_output(result, echo, capture), tm.TimingManager(f"{module.__name__} Part{part}", report=False) as timing:
+            with profiling(result, profile, stats_file):
+                result.answer = part_function()
+    finally:
+        current_result = None
+    result.elapsed = timing.elapsed
+    result.cpu = timing.cpu
+    if result.profile is not None and echo:
+        print_profile(result.profile)
+    return result
+
+
+def cached_part(result, echo):
+    """return a PartResult from the answer cache, echoing its output"""
+    result.cached = True
+    if echo:
+        print(result.output, end='')
+        print(f"(cached, elapsed {tm.format_seconds(result.elapsed)})")
+    return result
+
+
+# profiling
+#   with profile=N (--profile on the command line, N is PROFILE_TOP) each part is run
+#   under cProfile and tracemalloc, the top N functions by cumulative time and the
+#   top N allocation sites (the memory still allocated at the end of the part, by
+#   source line) are recorded in the part's PartResult.profile
+PROFILE_TOP = 15
+
+# frames from these files are the harness, not the puzzle, and are left out of the report
+PROFILE_HIDDEN = ('advent.py', 'contextlib.py', 'TimingManager.py', 'tracemalloc.py', 'cProfile.py')
+
+
+@contextlib.contextmanager
+def profiling(result, top, stats_file=None):
+    """profile the block with cProfile and tracemalloc, result.profile is set to the report
+         the raw cProfile stats are dumped to stats_file (if given)
+    """
+    if not top:
+        yield
+        return
+    import cProfile
+    import tracemalloc
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if stats_file is not None:
+            profiler.dump_stats(stats_file)
+        result.profile = {'functions': profile_functions(profiler, top),
+                          'allocations': profile_allocations(snapshot, top),
+                          'peak_memory': peak}
+
+
+def profile_site(file_name, line_no, name=None):
+    """a short name for a function or source line: Day18/advent_puzzle.py:120(parse)"""
+    if file_name != '~':
+        parent, file_name = os.path.split(file_name)
+        file_name = os.path.join(os.path.basename(parent), file_name)
+    site = name if file_name == '~' else f"{file_name}:{line_no}"
+    if name is not None and file_name != '~':
+        site += f"({name})"
+    return site
+
+
+def profile_functions(profiler, top):
+    """the top functions by cumulative time"""
+    import pstats
+    stats = pstats.Stats(profiler).stats
+    functions = []
+    for (file_name, line_no, name), (_, calls, own_time, cumulative_time, _) in stats.items():
+        if os.path.basename(file_name) in PROFILE_HIDDEN or name.startswith('<lambda>') or '_lsprof' in name:
+            continue
+        functions.append({'function': profile_site(file_name, line_no, name), 'calls': calls,
+                          'tottime': own_time, 'cumtime': cumulative_time})
+    functions.sort(key=lambda function: function['cumtime'], reverse=True)
+    return functions[:top]
+
+
+def profile_allocations(snapshot, top):
+    """the top allocation sites (by the size still allocated)"""
+    import tracemalloc
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, '*/' + hidden) for hidden in PROFILE_HIDDEN])
+    return [{'site': profile_site(stat.traceback[0].filename, stat.traceback[0].lineno),
+             'size': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:top]]
+
+
+def print_profile(profile):
+    """print a part's profile report"""
+    print(f"\n{'cumulative':>10s} {'own':>10s} {'calls':>9s}  function")
+    for function in profile['functions']:
+        print(f"{tm.format_seconds(function['cumtime']):>10s} {tm.format_seconds(function['tottime']):>10s} "
+              f"{function['calls']:9d}  {function['function']}")
+    print(f"\n{'size':>10s} {'blocks':>10s}  allocation site (peak traced memory {tm.format_bytes(profile['peak_memory'])})")
+    for allocation in profile['allocations']:
+        print(f"{tm.format_bytes(allocation['size']):>10s} {allocation['count']:10d}  {allocation['site']}")
+
+
+def profile_file(module, input_file, suffix):
+    """the name of a profile output file, in the module's directory: <input>_<suffix>"""
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(module.__file__)), f"{stem}_{suffix}")
+
+
+def save_profile(file_name, module, input_file, results):
+    """save the profile reports of the parts as json"""
+    import json
+    report = {'module': module.__name__, 'input': input_file,
+              'parts': {part: dict(result.profile, elapsed=result.elapsed)
+                        for part, result in results.items() if result.profile is not None}}
+    with open(file_name, 'w') as profile_json:
+        json.dump(report, profile_json, indent=1)
+
+
+def diagnostic(name, value):
+    """record diagnostic data for the part that is currently running"""
+    if current_result is not None:
+        current_result.diagnostics[name] = value
         
+
+@contextlib.contextmanager
+def part_output(result, echo, capture=False):
+    """if not echoing (or if capture is True), capture the output of a part into its PartResult"""
+    if echo and not capture:
+        yield
+        return
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            yield
+    finally:
+        result.output = output.getvalue()
+        if echo:
+            print(result.output, end='')
+
+
+@contextlib.contextmanager
+def echo_output(echo):
+    """discard the output if not echoing"""
+    if echo:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# the answer cache
+#   an sqlite database (answer_cache.sqlite) in each day's directory, it holds the
+#   PartResults of the last run of each input file (and part), along with the hashes
+#   of the input file and of the module's source.  A cached result is only used
+#   while both hashes are unchanged, so editing a day only invalidates that day.
+#   (changes to shared code, advent.py for example, are not detected, delete the
+#   answer_cache.sqlite files after changing it)
+ANSWER_CACHE = 'answer_cache.sqlite'
+
+
+def file_hash(file_name):
+    """the sha256 of a file's contents"""
+    import hashlib
+    with open(file_name, 'rb') as hashed_file:
+        return hashlib.sha256(hashed_file.read()).hexdigest()
+
+
+def answer_key(input_file, module, part):
+    """key for the answer cache: the hash of the input file, the part(s) run (and the backend
+       used, the timings depend on it, and the verbosity, the captured output depends on it)
+       and the hash of the module's source
+    """
+    return (file_hash(input_file), f"{part} {backend} {verbosity}", file_hash(module.__file__))
+
+
+def answer_cache(module):
+    """open (creating it if needed) the answer cache in the module's directory"""
+    cache_file = os.path.join(os.path.dirname(os.path.abspath(module.__file__)), ANSWER_CACHE)
+    import sqlite3
+    # several processes (test_all.py) may use the same cache, wait for the others' writes
+    connection = sqlite3.connect(cache_file, timeout=60)
+    connection.execute("CREATE TABLE IF NOT EXISTS answers "
+                       "(input_hash TEXT, part TEXT, source_hash TEXT, results BLOB, "
+                       "PRIMARY KEY (input_hash, part))")
+    return connection
+
+
+def load_answers(module, key):
+    """return the cached PartResults for a key, or None"""
+    import pickle
+    input_hash, part, source_hash = key
+    with contextlib.closing(answer_cache(module)) as connection:
+        row = connection.execute("SELECT results FROM answers WHERE input_hash=? AND part=? AND source_hash=?",
+                                 (input_hash, part, source_hash)).fetchone()
+    if row is None:
+        return None
+    return pickle.loads(row[0])
+
+
+def save_answers(module, key, results):
+    """save the PartResults for a key (replacing the results from an older version of the source)"""
+    import pickle
+    input_hash, part, source_hash = key
+    with contextlib.closing(answer_cache(module)) as connection:
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)",
+                               (input_hash, part, source_hash, pickle.dumps(results)))
+
         
 def print_description(desc, part):
     if type(desc) == str:
@@ -116,17 +638,111 @@ def print_description(desc, part):
     print()
         
 # functions common to all puzzles
-def read_input(file_name, prep_function=None):
-    """read the input lines into a list"""
-    lines = []
+
+# cache of the lines read from each input file
+#   keyed by (input_key, prep_function), contains the list of lines
+#   an entry is only used while the file's modification time and size are unchanged
+input_cache = {}
+
+# cache of the parsed input (see prepared)
+#   keyed by (module name, prepare function name, input_key)
+parsed_cache = {}
+
+# the caches only keep this many entries (the most recently used), so a run over many
+# input files does not keep all of their lines and parsed inputs alive
+CACHE_ENTRIES = 8
+
+
+def cached(cache, key, compute):
+    """return the value cached for key, calling compute() to get it if it is not cached
+         the least recently used entries are dropped to keep CACHE_ENTRIES in the cache
+    """
+    if key in cache:
+        # move it to the end, the most recently used
+        value = cache.pop(key)
+    else:
+        value = compute()
+    cache[key] = value
+    while len(cache) > CACHE_ENTRIES:
+        del cache[next(iter(cache))]
+    return value
+
+
+def input_key(file_name):
+    """key for the caches: the file's absolute path, modification time and size
+       (so editing the file invalidates its cache entries)
+    """
+    stat = os.stat(file_name)
+    return (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+
+
+def read_input(file_name, prep_function=None, stream=False):
+    """read the input lines into a list
+         the lines are cached (see CACHE_ENTRIES), reading the same (unchanged) file again only
+         costs a copy of the list
+         if stream is True a generator of the lines is returned instead (see stream_input)
+    """
+    if stream:
+        return stream_input(file_name, prep_function)
+    def read():
+        lines = []
+        for line in read_lines(file_name):
+            line = line.rstrip()
+            if prep_function:
+                line = prep_function(line)
+            lines.append(line)
+        return lines
+    
+    # return a copy, some puzzles consume their lines
+    return list(cached(input_cache, (input_key(file_name), prep_function), read))
+
+
+def stream_input(file_name, prep_function=None):
+    """generate the input lines one at a time, prep_function is applied to each line as it is read
+         nothing is cached, only the current line is in memory
+    """
     with open(file_name) as input_file:
         for line in input_file:
             line = line.rstrip()
             if prep_function:
                 line = prep_function(line)
-            lines.append(line)
+            yield line
+
+
+def read_lines(file_name):
+    """read the lines from a file (in one read, split in C)"""
+    with open(file_name) as input_file:
+        text = input_file.read()
+    lines = text.split('\n')
+    # a final newline does not start another line
+    if lines and lines[-1] == '':
+        lines.pop()
     return lines
 
+
+def input_file_name():
+    """the path of the input file being run (None if no puzzle is running)
+         for puzzles that load the whole file themselves (with NumPy, for example)
+    """
+    if current_input is None:
+        return None
+    return current_input[0]
+
+
+def prepared(prepare_function, lines, settings=()):
+    """return prepare_function(lines), parsing the input only once per input file
+         the parsed input is cached by day (the function's module), the prepare function and
+         the input file, and shared by both parts and any later runs of the same (unchanged) file
+         while it is one of the most recently used (see CACHE_ENTRIES).
+         settings are any other values the result depends on (an engine or the backend, for
+         example), they are part of the key so changing one does not reuse the old result.
+         the parsed input must not be modified by the caller
+    """
+    if current_input is None:
+        return prepare_function(lines)
+    key = (prepare_function.__module__, prepare_function.__qualname__, current_input, tuple(settings))
+    return cached(parsed_cache, key, lambda: prepare_function(lines))
+
 def split__command_number(line):
     """split a line into a list with a command (str) and a number (int)"""
     line = line.split()
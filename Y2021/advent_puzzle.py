@@ -23,12 +23,12 @@ class AdventPuzzle():
 
 
     def puzzle_part1(self):
-        """run  part1 of puzzle"""
+        """run  part1 of puzzle, return the answer"""
         
         
     
     def puzzle_part2(self):
-        """run part2 of puzzle"""
+        """run part2 of puzzle, return the answer"""
         
         
     def prepare_input_list(self, lines):
@@ -16,12 +16,12 @@ description = ("",       # part 1
 
 
 def puzzle_part1(lines):
-    """run  part1 of puzzle"""
+    """run  part1 of puzzle, return the answer"""
     pass
     
     
 def puzzle_part2(lines):
-    """run part2 of puzzle"""
+    """run part2 of puzzle, return the answer"""
     pass
     
 def prepare_input_list(lines):
@@ -0,0 +1,557 @@
+import os
+import sys
+import random
+import itertools
+import argparse
+
+# Generators of synthetic inputs, of any size, for the Advent of Code 2021 puzzles
+#
+# to run:
+#   navigate to the folder containing generate.py and advent.py (.../Y2021)
+#   execute  python3 generate.py Day15 500 [--seed 0] [-o file]
+#
+# this writes a valid input for Day15 with a 500x500 risk map to Day15/generated/size_500.txt
+# (or to the file given with -o).  test_all.py --scale uses the generators to time each
+# day at several sizes, to show how the run time grows with the size of the input
+#
+# every generator is called with a size and a random.Random, and returns the input
+# lines.  The meaning of the size depends on the day (the side of a grid, the number
+# of lines, ...), GENERATORS has the size of the real puzzle input and what it counts.
+# The same size and seed always give the same input
+#
+# a few days (Day21, Day23, Day24) have inputs of a fixed size, their generators
+# ignore the size and just give a random input
+
+GENERATED_DIR = 'generated'
+
+
+def day1(size, rng):
+    """size depth measurements, a random walk that tends to get deeper"""
+    depth = 100
+    lines = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-8, 12))
+        lines.append(str(depth))
+    return lines
+
+
+def day2(size, rng):
+    """size submarine commands"""
+    return [f"{rng.choice(('forward', 'forward', 'down', 'down', 'up'))} {rng.randint(1, 9)}" for _ in range(size)]
+
+
+def day3(size, rng):
+    """size different binary numbers (at least 12 bits wide, wider if needed to make them different)
+         no column has as many ones as zeros (part 1 has no rule for a tie)
+    """
+    width = max(12, (2 * size).bit_length())
+    numbers = rng.sample(range(2 ** width), size)
+    
+    # break a tie in a column by flipping that bit of one of the numbers (which only
+    # changes the counts of that column), to a number that is not already in the report
+    present = set(numbers)
+    for bit in range(width):
+        ones = sum(1 for number in numbers if number >> bit & 1)
+        if 2 * ones != size:
+            continue
+        for i, number in enumerate(numbers):
+            flipped = number ^ (1 << bit)
+            if flipped not in present:
+                present.remove(number)
+                present.add(flipped)
+                numbers[i] = flipped
+                break
+    return [format(number, f"0{width}b") for number in numbers]
+
+
+def day4(size, rng):
+    """size bingo boards, the numbers drawn are all of the numbers on the boards"""
+    numbers = list(range(100))
+    draws = list(numbers)
+    rng.shuffle(draws)
+    lines = [','.join(str(number) for number in draws)]
+    for _ in range(size):
+        lines.append('')
+        board = rng.sample(numbers, 25)
+        for row in range(5):
+            lines.append(' '.join(f"{number:2d}" for number in board[row*5:row*5+5]))
+    return lines
+
+
+def day5(size, rng, extent=1000):
+    """size horizontal, vertical and diagonal lines, in a 1000x1000 area"""
+    lines = []
+    for _ in range(size):
+        x0, y0 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        # (the lines are never a single point, the other end is a non zero offset, wrapped
+        # around the area)
+        if kind == 0:
+            x1, y1 = (x0 + rng.randrange(1, extent)) % extent, y0
+        elif kind == 1:
+            x1, y1 = x0, (y0 + rng.randrange(1, extent)) % extent
+        else:
+            # a 45 degree diagonal that stays inside the area
+            dx = 1 if x0 < extent // 2 else -1
+            dy = 1 if y0 < extent // 2 else -1
+            limit_x = extent - 1 - x0 if dx > 0 else x0
+            limit_y = extent - 1 - y0 if dy > 0 else y0
+            length = rng.randint(1, min(limit_x, limit_y))
+            x1, y1 = x0 + dx*length, y0 + dy*length
+        lines.append(f"{x0},{y0} -> {x1},{y1}")
+    return lines
+
+
+def day6(size, rng):
+    """size lanternfish"""
+    return [','.join(str(rng.randint(1, 5)) for _ in range(size))]
+
+
+def day7(size, rng):
+    """size crab positions"""
+    return [','.join(str(min(1999, int(rng.expovariate(1/300)))) for _ in range(size))]
+
+
+# the segments lit for each digit
+SEGMENTS = ('abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg')
+
+def day8(size, rng):
+    """size displays, each with its own wiring"""
+    lines = []
+    for _ in range(size):
+        wires = list('abcdefg')
+        rng.shuffle(wires)
+        wiring = dict(zip('abcdefg', wires))
+
+        def pattern(digit):
+            """the scrambled pattern for a digit, in a random order"""
+            letters = [wiring[segment] for segment in SEGMENTS[digit]]
+            rng.shuffle(letters)
+            return ''.join(letters)
+
+        digits = list(range(10))
+        rng.shuffle(digits)
+        output = [rng.randrange(10) for _ in range(4)]
+        lines.append(' '.join(pattern(digit) for digit in digits) + ' | ' + ' '.join(pattern(digit) for digit in output))
+    return lines
+
+
+def day9(size, rng):
+    """a size x size height map
+         the map is divided into rectangles by walls of 9's, each rectangle is a basin
+         with one low point, the heights grow with the distance from the low point
+    """
+    def walls():
+        positions = []
+        position = rng.randint(3, 12)
+        while position < size - 2:
+            positions.append(position)
+            position += rng.randint(4, 14)
+        return positions
+
+    wall_x = walls()
+    wall_y = walls()
+    bounds_x = list(zip([-1] + wall_x, wall_x + [size]))
+    bounds_y = list(zip([-1] + wall_y, wall_y + [size]))
+
+    grid = [[9] * size for _ in range(size)]
+    for y_first, y_last in bounds_y:
+        for x_first, x_last in bounds_x:
+            if x_last - x_first < 2 or y_last - y_first < 2:
+                continue
+            low_x = rng.randint(x_first + 1, x_last - 1)
+            low_y = rng.randint(y_first + 1, y_last - 1)
+            for y in range(y_first + 1, y_last):
+                for x in range(x_first + 1, x_last):
+                    grid[y][x] = min(8, abs(x - low_x) + abs(y - low_y))
+    return [''.join(str(height) for height in row) for row in grid]
+
+
+BRACKETS = {'(': ')', '[': ']', '{': '}', '<': '>'}
+
+def day10(size, rng, length=100):
+    """size lines of chunks, about half of them corrupted and the rest incomplete"""
+    lines = []
+    for _ in range(size):
+        corrupt = rng.random() < 0.5
+        corrupt_at = rng.randrange(length // 2, length)
+        stack = []
+        line = []
+        while len(line) < length:
+            if corrupt and len(line) >= corrupt_at and stack:
+                # close the last chunk with the wrong character
+                expected = stack.pop()
+                line.append(rng.choice([c for c in BRACKETS.values() if c != expected]))
+                corrupt = False
+            elif not stack or rng.random() < 0.55:
+                opening = rng.choice(list(BRACKETS))
+                stack.append(BRACKETS[opening])
+                line.append(opening)
+            else:
+                line.append(stack.pop())
+        if not stack:
+            # an incomplete line must have an unclosed chunk
+            line.append(rng.choice(list(BRACKETS)))
+        lines.append(''.join(line))
+    return lines
+
+
+def day11(size, rng):
+    """a size x size grid of octopus energy levels"""
+    return [''.join(str(rng.randint(0, 9)) for _ in range(size)) for _ in range(size)]
+
+
+def day12(size, rng):
+    """a cave system with size caves (besides start and end)
+         about a third of the caves are big, big caves are never connected to each other
+         (the number of paths grows exponentially with the size, keep it small)
+    """
+    names = set()
+
+    def new_name(big):
+        while True:
+            name = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(2))
+            name = name.upper() if big else name
+            if name not in names:
+                names.add(name)
+                return name
+
+    big = [new_name(True) for _ in range(max(1, size // 3))]
+    small = [new_name(False) for _ in range(max(1, size - len(big)))]
+    edges = set()
+
+    def connect(a, b):
+        if a != b and (b, a) not in edges:
+            edges.add((a, b))
+
+    # every small cave is connected to a big cave, and to another small cave
+    for cave in small:
+        connect(cave, rng.choice(big))
+        connect(cave, rng.choice(small))
+    # start and end are each connected to a couple of small caves and a big cave
+    for cave in rng.sample(small, min(2, len(small))) + [rng.choice(big)]:
+        connect('start', cave)
+    for cave in rng.sample(small, min(2, len(small))) + [rng.choice(big)]:
+        connect(cave, 'end')
+    edges = list(edges)
+    rng.shuffle(edges)
+    return [f"{a}-{b}" for a, b in edges]
+
+
+def day13(size, rng, folds=6):
+    """size dots, and 6 folds along each axis
+         the dots of a random 40x6 code are 'unfolded' to random positions
+    """
+    width, height = 40, 6
+    dots = [(rng.randrange(width), rng.randrange(height)) for _ in range(size)]
+    fold_lines = []
+    for _ in range(folds):
+        # unfold the grid to the right and down
+        fold_lines.append(('x', width))
+        dots = [(2*width - x if rng.random() < 0.5 else x, y) for x, y in dots]
+        width = 2*width + 1
+        fold_lines.append(('y', height))
+        dots = [(x, 2*height - y if rng.random() < 0.5 else y) for x, y in dots]
+        height = 2*height + 1
+    lines = [f"{x},{y}" for x, y in sorted(set(dots), key=lambda dot: rng.random())]
+    lines.append('')
+    # the folds are done in the reverse order of the unfolds
+    lines += [f"fold along {axis}={position}" for axis, position in reversed(fold_lines)]
+    return lines
+
+
+def day14(size, rng, elements='BCFHKNOPSV'):
+    """a polymer template of size elements, and a rule for every pair of the 10 elements"""
+    lines = [''.join(rng.choice(elements) for _ in range(size)), '']
+    lines += [f"{a}{b} -> {rng.choice(elements)}" for a in elements for b in elements]
+    return lines
+
+
+def day15(size, rng):
+    """a size x size risk map"""
+    return [''.join(str(rng.choice((1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9))) for _ in range(size)) for _ in range(size)]
+
+
+def day16(size, rng):
+    """a transmission of about size packets"""
+    def literal(value):
+        groups = []
+        while True:
+            groups.insert(0, value & 0xF)
+            value >>= 4
+            if not value:
+                break
+        bits = ''.join(('1' if i < len(groups) - 1 else '0') + format(group, '04b') for i, group in enumerate(groups))
+        return format(rng.randrange(8), '03b') + '100' + bits
+
+    def packet(budget, depth):
+        """a packet containing about budget packets"""
+        if budget <= 1 or depth > 20:
+            return literal(rng.randrange(1 << rng.choice((4, 8, 12))))
+        type_id = rng.choice((0, 1, 2, 3, 5, 6, 7))
+        if type_id >= 5:
+            # comparisons have exactly two subpackets
+            count = 2
+        elif type_id == 1:
+            # keep the products from growing too big
+            count = rng.randint(1, 3)
+        else:
+            count = rng.randint(1, min(budget - 1, 6))
+        sub_budget = max(1, (budget - 1) // count)
+        subpackets = [packet(sub_budget, depth + 1) for _ in range(count)]
+        body = ''.join(subpackets)
+        if rng.random() < 0.5:
+            header = '0' + format(len(body), '015b')
+        else:
+            header = '1' + format(count, '011b')
+        return format(rng.randrange(8), '03b') + format(type_id, '03b') + header + body
+
+    bits = packet(size, 0)
+    bits += '0' * (-len(bits) % 4)
+    return [format(int(bits, 2), f"0{len(bits)//4}X")]
+
+
+def day17(size, rng):
+    """a target area whose far edge is size steps away (the depth is limited to 199)"""
+    x_min = max(2, size // 2 + rng.randint(0, size // 10 + 1))
+    y_min = -min(199, max(10, size + size // 2))
+    y_max = y_min + max(5, -y_min // 4)
+    return [f"target area: x={x_min}..{max(x_min + 5, size)}, y={y_min}..{y_max}"]
+
+
+def day18(size, rng):
+    """size snailfish numbers"""
+    def number(depth):
+        if depth == 4 or (depth > 0 and rng.random() < 0.3):
+            return str(rng.randint(0, 9))
+        return f"[{number(depth + 1)},{number(depth + 1)}]"
+    return [f"[{number(1)},{number(1)}]" for _ in range(size)]
+
+
+def rotations():
+    """the 24 rotations, as functions of a point"""
+    result = []
+    for axes in itertools.permutations(range(3)):
+        # an odd permutation of the axes is a reflection, unless an odd number of axes are negated
+        inversions = sum(1 for i in range(3) for j in range(i+1, 3) if axes[i] > axes[j])
+        for signs in itertools.product((1, -1), repeat=3):
+            if (-1) ** inversions * signs[0] * signs[1] * signs[2] == 1:
+                result.append(lambda p, axes=axes, signs=signs: tuple(s * p[a] for a, s in zip(axes, signs)))
+    return result
+
+
+def day19(size, rng, view=1000):
+    """size scanners, each one overlaps (at least 12 beacons) with the one before it"""
+    # the scanners are a chain, each one placed near the one before it (far enough
+    # that the scanners do not see too many beacons, like the real input)
+    # a scanner's view does not overlap the views of the scanners before that (if that
+    # can be found in a few tries)
+    def distance(a, b):
+        return max(abs(p - q) for p, q in zip(a, b))
+
+    positions = [(0, 0, 0)]
+    for _ in range(size - 1):
+        for _ in range(50):
+            position = tuple(c + rng.choice((-1, 1)) * rng.randint(1000, 1300) for c in positions[-1])
+            if all(distance(position, other) > 2*view for other in positions[:-1]):
+                break
+        positions.append(position)
+
+    def in_view(scanner, beacon):
+        return all(abs(b - s) <= view for s, b in zip(scanner, beacon))
+
+    beacons = set()
+    for i, scanner in enumerate(positions):
+        # beacons in this scanner's view
+        for _ in range(3):
+            beacons.add(tuple(c + rng.randint(-view, view) for c in scanner))
+        # and at least 12 shared with the scanner before it
+        if i:
+            neighbor = positions[i-1]
+            low = [max(a, b) - view for a, b in zip(scanner, neighbor)]
+            high = [min(a, b) + view for a, b in zip(scanner, neighbor)]
+            for _ in range(12):
+                beacons.add(tuple(rng.randint(l, h) for l, h in zip(low, high)))
+
+    all_rotations = rotations()
+    lines = []
+    for i, scanner in enumerate(positions):
+        # scanner 0 is the reference, the others see their beacons in a random orientation
+        rotate = all_rotations[0] if i == 0 else rng.choice(all_rotations)
+        lines.append(f"--- scanner {i} ---")
+        seen = [beacon for beacon in beacons if in_view(scanner, beacon)]
+        rng.shuffle(seen)
+        for beacon in seen:
+            lines.append(','.join(str(c) for c in rotate(tuple(b - s for b, s in zip(beacon, scanner)))))
+        lines.append('')
+    return lines
+
+
+def day20(size, rng):
+    """an enhancement algorithm and a size x size image"""
+    table = [rng.choice('.#') for _ in range(512)]
+    # like the real inputs, the infinite background flashes on and off
+    table[0], table[511] = '#', '.'
+    lines = [''.join(table), '']
+    lines += [''.join(rng.choice('.#') for _ in range(size)) for _ in range(size)]
+    return lines
+
+
+def day21(size, rng):
+    """two random starting positions (the size is ignored)"""
+    return [f"Player {player} starting position: {rng.randint(1, 10)}" for player in (1, 2)]
+
+
+def day22(size, rng):
+    """size reboot steps, the first 20 are in the -50..50 region"""
+    lines = []
+    for i in range(size):
+        if i < 20:
+            extent, length = 50, 50
+        else:
+            extent, length = 90000, 40000
+        ranges = []
+        for _ in range(3):
+            low = rng.randint(-extent, extent - 1)
+            ranges.append((low, min(extent, low + rng.randint(1, length))))
+        state = 'on' if i < 10 or rng.random() < 0.5 else 'off'
+        lines.append(f"{state} x={ranges[0][0]}..{ranges[0][1]},y={ranges[1][0]}..{ranges[1][1]},z={ranges[2][0]}..{ranges[2][1]}")
+    return lines
+
+
+def day23(size, rng):
+    """a random burrow for each part (the size is ignored)"""
+    pods = list('AABBCCDD')
+    rng.shuffle(pods)
+    top, bottom = pods[:4], pods[4:]
+    lines = ['#############',
+             '#...........#',
+             f"  #{'#'.join(top)}#  ",
+             f"  #{'#'.join(bottom)}#",
+             '', '', '',
+             '#############',
+             '#...........#',
+             f"  #{'#'.join(top)}#  ",
+             '  #D#C#B#A#',
+             '  #D#B#A#C#',
+             f"  #{'#'.join(bottom)}#"]
+    return lines
+
+
+def day24(size, rng):
+    """a MONAD program with random constants (the size is ignored, it always checks 14 digits)"""
+    # 7 digits are stored and 7 are checked against the stored digits, nested like brackets
+    kinds = []
+    stored = 0
+    for step in range(14):
+        checks_left = 14 - step
+        if stored and (stored == checks_left or rng.random() < 0.5):
+            kinds.append('check')
+            stored -= 1
+        else:
+            kinds.append('store')
+            stored += 1
+
+    lines = []
+    stack = []
+    for kind in kinds:
+        if kind == 'store':
+            store_val = rng.randint(0, 16)
+            stack.append(store_val)
+            div, x_val, y_val = 1, rng.randint(10, 16), store_val
+        else:
+            # the check digit is the stored digit plus a difference (-8..8)
+            store_val = stack.pop()
+            div, x_val, y_val = 26, rng.randint(-8, 8) - store_val, rng.randint(0, 16)
+        lines += ['inp w', 'mul x 0', 'add x z', 'mod x 26', f"div z {div}", f"add x {x_val}",
+                  'eql x w', 'eql x 0', 'mul y 0', 'add y 25', 'mul y x', 'add y 1', 'mul z y',
+                  'mul y 0', 'add y w', f"add y {y_val}", 'mul y x', 'add z y']
+    return lines
+
+
+def day25(size, rng):
+    """a size x size grid of sea cucumbers"""
+    return [''.join(rng.choice('>>vv.....') for _ in range(size)) for _ in range(size)]
+
+
+# for each day: the generator, the size of the real input (None if the input has a fixed size)
+# and what the size counts
+GENERATORS = {
+    'Day1':  (day1,  2000, 'depths'),
+    'Day2':  (day2,  1000, 'commands'),
+    'Day3':  (day3,  1000, 'numbers'),
+    'Day4':  (day4,  100,  'boards'),
+    'Day5':  (day5,  500,  'lines'),
+    'Day6':  (day6,  300,  'lanternfish'),
+    'Day7':  (day7,  1000, 'crabs'),
+    'Day8':  (day8,  200,  'displays'),
+    'Day9':  (day9,  100,  'map side'),
+    'Day10': (day10, 100,  'lines'),
+    'Day11': (day11, 10,   'grid side'),
+    'Day12': (day12, 11,   'caves'),
+    'Day13': (day13, 730,  'dots'),
+    'Day14': (day14, 20,   'template length'),
+    'Day15': (day15, 100,  'map side'),
+    'Day16': (day16, 250,  'packets'),
+    'Day17': (day17, 116,  'target distance'),
+    'Day18': (day18, 100,  'numbers'),
+    'Day19': (day19, 26,   'scanners'),
+    'Day20': (day20, 100,  'image side'),
+    'Day21': (day21, None, ''),
+    'Day22': (day22, 420,  'steps'),
+    'Day23': (day23, None, ''),
+    'Day24': (day24, None, ''),
+    'Day25': (day25, 139,  'grid side'),
+}
+
+
+def generate(day, size=None, seed=0):
+    """return the lines of a generated input for a day (default size is the size of the real input)"""
+    generator, real_size, _ = GENERATORS[day]
+    if size is None:
+        size = real_size
+    return generator(size, random.Random(f"{day}/{size}/{seed}"))
+
+
+def generated_file(day, size, seed=0):
+    """the name of the file for a generated input"""
+    name = f"size_{size}.txt" if seed == 0 else f"size_{size}_seed_{seed}.txt"
+    return os.path.join(day, GENERATED_DIR, name)
+
+
+def write_input(day, size=None, seed=0, file_name=None):
+    """generate an input for a day and write it to a file (the file is only written once), return the file name"""
+    if size is None:
+        size = GENERATORS[day][1]
+    if file_name is None:
+        file_name = generated_file(day, size, seed)
+        if os.path.isfile(file_name):
+            return file_name
+    lines = generate(day, size, seed)
+    directory = os.path.dirname(file_name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_name, 'w') as output:
+        output.write('\n'.join(lines) + '\n')
+    return file_name
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='generate inputs for the Advent of Code 2021 puzzles')
+    parser.add_argument('day', choices=list(GENERATORS), metavar='day', help='the day (e.g. Day15)')
+    parser.add_argument('size', type=int, nargs='?', default=None, help='size of the input (default: the size of the real input)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default 0)')
+    parser.add_argument('-o', '--output', default=None, help='output file (default DayN/generated/size_N.txt)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    if args.size is not None and args.size < 1:
+        sys.exit('the size must be at least 1')
+    output = os.path.abspath(args.output) if args.output else None
+    # the days' paths are relative to the folder containing generate.py
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    file_name = write_input(args.day, args.size, args.seed, output)
+    print(f"{args.day}: {GENERATORS[args.day][0].__doc__.splitlines()[0]}")
+    print(f"written to {file_name}")
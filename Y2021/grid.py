@@ -0,0 +1,188 @@
+from array import array
+
+import advent
+
+# Grid is a 2D grid of small integers, shared by the puzzles that work on a map
+# (Day5, Day9, Day11, Day13, Day15, Day20, Day25)
+#
+#   import grid
+#
+#   heights = grid.Grid.from_rows([[int(c) for c in line] for line in lines], pad=1, border=9)
+#   for i in heights.interior():
+#       for n in heights.offsets(grid.ORTHOGONAL):
+#           ... heights.cells[i+n] ...
+#
+# the cells are stored in a single flat array (one byte per cell with the default
+# typecode 'b'), row by row.  A cell is addressed by its flat index, the neighbor
+# of cell i at dx,dy is cell i + dx + dy*stride, so the neighbor offsets are
+# computed once and no (x,y) tuples are created while walking the grid.
+#
+# the grid can have a padding border ('pad' cells wide, filled with 'border') around
+# the width x height interior.  With a border whose value stops the puzzle's search
+# (a 9 in Day9, a 0 in Day11) the neighbors of the interior cells never need to be
+# bounds checked.  Grids without a border can use neighbor_table, which lists only
+# the neighbors that are in the grid (or wraps around the edges)
+#
+# with the numpy backend (advent.use_numpy()) the puzzles work on NumPy arrays
+# instead, to_numpy returns the grid as one and neighbor_sum does the neighbor
+# counting that the python code does with the offsets
+
+# neighbor deltas (dx, dy)
+ORTHOGONAL = ((0,-1), (-1,0), (1,0), (0,1))
+DIAGONAL =   ((-1,-1), (1,-1), (-1,1), (1,1))
+ALL =        ((-1,-1), (0,-1), (1,-1), (-1,0), (1,0), (-1,1), (0,1), (1,1))
+# the 3x3 square around a cell (including the cell) in reading order
+SQUARE =     ((-1,-1), (0,-1), (1,-1), (-1,0), (0,0), (1,0), (-1,1), (0,1), (1,1))
+
+
+class Grid():
+    """a 2D grid of small integers stored in a flat array"""
+    def __init__(self, width, height, fill=0, pad=0, border=None, typecode='b'):
+        """create a width x height grid filled with 'fill'
+             pad is the width of the border around the grid, its cells are set to border
+             (default is fill).  typecode is the array typecode ('b' is -128..127, 'B' is
+             0..255, 'H' or 'l' for bigger values)
+        """
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.typecode = typecode
+        self.stride = width + 2*pad
+        self.cells = array(typecode, [fill]) * (self.stride * (height + 2*pad))
+        if pad and border is not None and border != fill:
+            self.fill_border(border)
+
+    @classmethod
+    def from_rows(cls, rows, pad=0, border=0, typecode='b'):
+        """create a grid from a list of rows (lists of ints)"""
+        grid = cls(len(rows[0]), len(rows), pad=pad, border=border, typecode=typecode)
+        for y, row in enumerate(rows):
+            start = grid.index(0, y)
+            grid.cells[start:start+grid.width] = array(typecode, row)
+        return grid
+
+    def copy(self):
+        """return a copy of the grid"""
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = array(self.typecode, self.cells)
+        return grid
+
+    def index(self, x, y):
+        """the flat index of the cell at x,y (0,0 is the top left of the interior)"""
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def xy(self, index):
+        """the x,y coordinates of a flat index"""
+        y, x = divmod(index, self.stride)
+        return x - self.pad, y - self.pad
+
+    def __getitem__(self, xy):
+        x, y = xy
+        return self.cells[self.index(x, y)]
+
+    def __setitem__(self, xy, value):
+        x, y = xy
+        self.cells[self.index(x, y)] = value
+
+    def offsets(self, deltas=ORTHOGONAL):
+        """the flat index offsets for a set of neighbor deltas"""
+        return tuple(dx + dy*self.stride for dx, dy in deltas)
+
+    def interior(self, grow=0):
+        """the flat indices of the interior cells, in reading order
+             grow extends the area into the border by that many cells
+        """
+        first = self.pad - grow
+        last_x = self.pad + self.width + grow
+        indices = []
+        for y in range(first, self.pad + self.height + grow):
+            start = y * self.stride
+            indices.extend(range(start + first, start + last_x))
+        return indices
+
+    def neighbor_table(self, deltas=ORTHOGONAL, wrap=False):
+        """the flat indices of the neighbors of every interior cell (indexed by flat index)
+             neighbors outside the interior are left out, or if wrap is True they
+             wrap around to the opposite edge.  Border cells have no neighbors
+        """
+        table = [()] * len(self.cells)
+        for y in range(self.height):
+            for x in range(self.width):
+                neighbors = []
+                for dx, dy in deltas:
+                    xp, yp = x+dx, y+dy
+                    if wrap:
+                        xp %= self.width
+                        yp %= self.height
+                    elif not (0 <= xp < self.width and 0 <= yp < self.height):
+                        continue
+                    neighbors.append(self.index(xp, yp))
+                table[self.index(x, y)] = tuple(neighbors)
+        return table
+
+    def fill(self, value):
+        """set every cell (including the border) to value"""
+        self.cells[:] = array(self.typecode, [value]) * len(self.cells)
+
+    def fill_border(self, value):
+        """set the cells of the border to value"""
+        stride = self.stride
+        row = array(self.typecode, [value]) * stride
+        for y in range(self.pad):
+            self.cells[y*stride:(y+1)*stride] = row
+            y = self.pad + self.height + y
+            self.cells[y*stride:(y+1)*stride] = row
+        side = array(self.typecode, [value]) * self.pad
+        for y in range(self.pad, self.pad + self.height):
+            start = y * stride
+            self.cells[start:start+self.pad] = side
+            self.cells[start+stride-self.pad:start+stride] = side
+
+    def count(self, value):
+        """count the interior cells containing value"""
+        if not self.pad:
+            return self.cells.count(value)
+        return sum(row.count(value) for row in self.row_arrays())
+
+    def count_over(self, value):
+        """count the interior cells greater than value"""
+        return sum(1 for row in self.row_arrays() for cell in row if cell > value)
+
+    def row_arrays(self):
+        """generate the interior rows as arrays"""
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield self.cells[start:start+self.width]
+
+    def rows(self):
+        """return the interior rows as lists"""
+        return [row.tolist() for row in self.row_arrays()]
+
+    def to_lines(self, chars):
+        """return the interior rows as strings, chars maps each cell value to a character"""
+        return [''.join(chars[cell] for cell in row) for row in self.row_arrays()]
+
+    def to_numpy(self):
+        """return the interior of the grid as a 2D NumPy array (a view, it shares the grid's cells)"""
+        np = advent.np
+        rows = np.frombuffer(self.cells, dtype=np.dtype(self.typecode)).reshape(-1, self.stride)
+        return rows[self.pad:self.pad+self.height, self.pad:self.pad+self.width]
+
+
+def neighbor_sum(values, deltas=ALL, wrap=False):
+    """for each cell of a 2D NumPy array, the sum of its neighbors' values
+         neighbors outside the array count as 0, or if wrap is True they
+         wrap around to the opposite edge
+    """
+    np = advent.np
+    total = np.zeros(values.shape, dtype=np.int64)
+    if wrap:
+        for dx, dy in deltas:
+            total += np.roll(values, (-dy, -dx), axis=(0, 1))
+        return total
+    height, width = values.shape
+    padded = np.pad(values.astype(np.int64), 1)
+    for dx, dy in deltas:
+        total += padded[1+dy:1+dy+height, 1+dx:1+dx+width]
+    return total
@@ -0,0 +1,193 @@
+import os
+import re
+import sys
+import importlib
+from dataclasses import dataclass
+
+import TimingManager as tm
+
+# registry of the days, a lightweight descriptor for each day's puzzle
+#
+#   import registry
+#
+#   day = registry.get('Day15')
+#   day.run()                   # import Day15.advent_puzzle and run both parts on its input
+#   module = day.load()         # or just import the module
+#
+# or from the command line (in .../Y2021)
+#   python3 registry.py Day15 [filename ...] [-q] [-c] [--numpy] [--profile] [-j workers]
+#   (several input files, globs or directories run in a batch, see advent.startup)
+#
+# a descriptor holds what is needed to run a day without importing it: the name of
+# its module, the names of its entry points, its default input file and whether
+# it is object style (an AdventPuzzle class whose constructor parses the input) or
+# function style (module level puzzle_part1 and puzzle_part2 functions).  A function
+# style day can also stream its input (its parts are passed a generator of the lines).
+# the days are found by discover (every DayN/advent_puzzle.py), and their style and
+# whether they stream are read from the advent.startup call in the module's source
+# (see startup_options), so the module is the only place they are set
+#
+# the module is only imported when the day is actually run (load), so looking up
+# a day, or listing them all, does not import any of them.  Importing a day module
+# has no side effects (advent.startup only runs the puzzle when the module is
+# __main__), so several days can be loaded into the same process, and test_all.py
+# loads each one in the worker process that runs it
+
+OBJECT = 'object'
+FUNCTION = 'function'
+
+
+@dataclass
+class DayDescriptor:
+    """what is needed to find and run one day's puzzle"""
+    name        : str               # the day's package, 'Day15'
+    style       : str               # OBJECT or FUNCTION
+    module_name : str = None        # default '<name>.advent_puzzle'
+    input_file  : str = 'input.txt' # the default input file (in the day's directory)
+    stream      : bool = None       # the parts are passed a stream of lines (see advent.puzzle)
+                                    # default: as the module's advent.startup call says
+
+    def __post_init__(self):
+        if self.style not in (OBJECT, FUNCTION):
+            raise ValueError(f"{self.name}: unknown style {self.style!r}")
+        if self.module_name is None:
+            self.module_name = self.name + '.advent_puzzle'
+        if self.stream is None:
+            self.stream = bool(startup_options(self.source_file).get('stream', False))
+        if self.stream and self.obj:
+            raise ValueError(f"{self.name}: only function style days can stream their input")
+
+    @property
+    def source_file(self):
+        """the path of the module's source (relative to the folder containing registry.py)"""
+        return os.path.join(*self.module_name.split('.')) + '.py'
+
+    @property
+    def obj(self):
+        """True for an object style day (the obj parameter of advent.puzzle)"""
+        return self.style == OBJECT
+
+    @property
+    def entry_points(self):
+        """the names of the entry points in the module"""
+        if self.obj:
+            return ('AdventPuzzle', 'description')
+        return ('puzzle_part1', 'puzzle_part2', 'description')
+
+    @property
+    def number(self):
+        """the day number, for sorting"""
+        return int(self.name[len('Day'):])
+
+    def load(self):
+        """import the day's module (only the first call imports it) and check its entry points
+             the import is timed with TimingManager as '<module name> Import'
+        """
+        with tm.TimingManager(f"{self.module_name} Import", report=False):
+            module = importlib.import_module(self.module_name)
+        missing = [name for name in self.entry_points if not hasattr(module, name)]
+        if missing:
+            raise AttributeError(f"{self.module_name} is registered as {self.style} style "
+                                 f"but has no {', '.join(missing)}")
+        return module
+
+    def find_input(self, input_name=None):
+        """the path of an input file for the day (default: its input_file), 'sample.txt'
+           is used if that does not exist.  None if neither exists
+        """
+        for name in (input_name or self.input_file, 'sample.txt'):
+            path = self.name + '/' + name
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def run(self, input_file=None, **kwargs):
+        """import the day and run it (see advent.puzzle for the other parameters)"""
+        import advent
+        if input_file is None:
+            input_file = self.find_input()
+        return advent.puzzle(input_file, obj=self.obj, module=self.load(), stream=self.stream, **kwargs)
+
+
+def startup_options(source_file):
+    """the keyword arguments (obj, stream) of the advent.startup call in a module's source
+         the source is parsed, not imported (only from the advent.startup line on, it is at
+         the end of the module).  Empty if there is no such call (or no file)
+    """
+    import ast
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), source_file)
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as source:
+        text = source.read()
+    start = text.rfind('\nadvent.startup(')
+    if start < 0:
+        return {}
+    tree = ast.parse(text[start:], path)
+    for statement in tree.body:
+        call = statement.value if isinstance(statement, ast.Expr) else None
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                and call.func.attr == 'startup'):
+            return {keyword.arg: ast.literal_eval(keyword.value) for keyword in call.keywords}
+    return {}
+
+
+# the registered days, by name
+days = {}
+
+
+def register(name, style, **kwargs):
+    """add a day to the registry"""
+    days[name] = DayDescriptor(name, style, **kwargs)
+    return days[name]
+
+
+def get(name):
+    """the descriptor of a registered day"""
+    if name not in days:
+        raise KeyError(f"{name} is not registered (see registry.py)")
+    return days[name]
+
+
+def all_days():
+    """the names of all of the registered days, in day order"""
+    return [day.name for day in sorted(days.values(), key=lambda day: day.number)]
+
+
+def discover(root=None):
+    """register every day package (DayN directory with an advent_puzzle.py) under root
+         (default: the folder containing registry.py).  The style of each day (and whether
+         it streams) is read from the advent.startup call in its module's source, so a
+         new day is found without being listed anywhere
+    """
+    if root is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+    for entry in os.listdir(root):
+        match = re.fullmatch(r'Day(\d+)', entry)
+        if match and os.path.isfile(os.path.join(root, entry, 'advent_puzzle.py')):
+            options = startup_options(os.path.join(entry, 'advent_puzzle.py'))
+            register(entry, OBJECT if options.get('obj') else FUNCTION,
+                     stream=bool(options.get('stream', False)))
+
+
+discover()
+
+
+if __name__ == '__main__':
+    # the days' paths are relative to the folder containing registry.py
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    import advent
+    if len(sys.argv) < 2 or sys.argv[1] not in days:
+        print(f"usage: python3 registry.py DayN [filename ...] [-q] [-c] [--numpy] [--profile] [-j workers]")
+        sys.exit(1)
+    day = get(sys.argv[1])
+    input_files, options, workers = advent.command_line(day.name + '/', sys.argv[2:])
+    if not input_files:
+        print("No input file found")
+        sys.exit(1)
+    if len(input_files) > 1:
+        failures = advent.run_batch(day.load(), input_files, obj=day.obj, stream=day.stream, workers=workers, **options)
+        if failures:
+            sys.exit(1)
+    else:
+        day.run(input_files[0], part='both', **options)
@@ -1,27 +1,527 @@
 import sys
+import os
+import json
+import math
+import time
+import statistics
+import argparse
+import traceback
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import advent
+import generate
+import registry
 import TimingManager as tm
 
 # Test driver for Advent of Code  2021
+#
+# to run:
+#   navigate to the folder containing test_all.py and advent.py (.../Y2021)
+#   execute  python3 test_all.py [-i input.txt] [-j workers] [--check] [--bench] [--cache] [--numpy] [--profile [N]] [Day1 Day5 ...]
+#   or       python3 test_all.py [Day1 Day5 ...] --scale [0.5 1 2 4 ...]
+#   or       python3 test_all.py --startup [budget ms] [Day1 Day5 ...]
+#
+# the days are found by registry.py, none of them is imported by the driver.  Each day
+# is loaded and run (both parts) in its own worker process, the worker pool is sized to the
+# number of cores, so the whole suite takes about as long as the slowest day.
+# The output of each part is captured in the worker, and the timings and answers
+# for all of the days are collected into a single report
+#
+# the days are run quietly (advent.QUIET: no grids, paths or progress messages are
+# rendered) so that the timings are not dominated by formatting output nobody will
+# read.  --check runs them at advent.VERBOSE, it compares the output with the golden files
+#
+# --check   regression mode: every day is run against each of its inputs that has
+#           a golden output file (input.txt -> results.txt, sample.txt -> sample_results.txt,
+#           sample2.txt -> sample2_results.txt, ...) and the answer line of each part
+#           is compared with the golden file
+# --bench   benchmark mode: the part timings are compared with the baselines recorded
+#           in bench_history.json, any part that is slower than its baseline by more than
+#           --threshold (default 25%) fails.  The timings of the run are then added to
+#           the history
+# --cache   use the answer cache (see advent.puzzle), days whose input and source are
+#           unchanged since they were last run are not run again, their answers, timings
+#           and output come from the cache.  Cached timings are not benchmarked
+# --numpy   use the numpy backend (see advent.puzzle), the grid days use NumPy array
+#           operations (if NumPy is installed)
+# --profile profile each part with cProfile and tracemalloc (see advent.puzzle), the
+#           reports are saved in each day's folder and the hot spots (the functions with
+#           the most time of their own) of every day are listed after the report
+# --startup startup budget mode: the time to import advent.py (the harness) and each
+#           day's module, read its input and construct its AdventPuzzle is reported
+#           separately from the parts.  The imports are timed in a fresh interpreter for
+#           each day (a cold start, see cold_start), the workers have advent imported
+#           already.  A day whose startup (harness + import + input + constructor) takes
+#           longer than the budget (default 100ms) fails, the work belongs in the part
+#           that needs it
+# --scale   scaling mode: every day is run with generated inputs (see generate.py) at
+#           several sizes, the factors are relative to the size of the real input
+#           (default 0.5 1 2).  The report shows how the time of each part grows with
+#           the size, as an exponent (time ~ size**exponent), a part whose exponent is
+#           more than --max-exponent (default 3) fails
+
+
+def find_days():
+    """the registered days (see registry.py), in day order"""
+    return registry.all_days()
+
+
+def find_input(package, input_name):
+    """find the input file for a day, using 'sample.txt' if the requested file does not exist"""
+    return registry.get(package).find_input(input_name)
+
+
+def golden_file(input_file):
+    """the name of the golden output file for an input file (input.txt -> results.txt)"""
+    path, name = os.path.split(input_file)
+    if name == 'input.txt':
+        return os.path.join(path, 'results.txt')
+    return os.path.join(path, name[:-len('.txt')] + '_results.txt')
+
+
+def find_checked_inputs(package):
+    """find all of the input files for a day that have a golden output file"""
+    inputs = []
+    for name in sorted(os.listdir(package)):
+        input_file = package + '/' + name
+        if name.endswith('.txt') and 'results' not in name and os.path.isfile(golden_file(input_file)):
+            inputs.append(input_file)
+    return inputs
+
+
+def run_day(package, input_file, verbosity=advent.QUIET, cache=False, backend='python', profile=0):
+    """run both parts of one day (this runs in a worker process) and return the results"""
+    result = {'day': package, 'input': input_file, 'parts': {}, 'startup': {}, 'error': None}
+    start = time.perf_counter()
+    try:
+        advent.verbosity = verbosity
+
+        # the day's module is only imported here, in the worker that runs it
+        # run both parts together (some days use results from part 1 in part 2)
+        # without echoing, the output of each part is captured in its PartResult
+        part_results = registry.get(package).run(input_file, part='both', echo=False,
+                                                 cache=cache, backend=backend, profile=profile)
+
+        for part, part_result in part_results.items():
+            result['parts'][part] = {'elapsed': part_result.elapsed,
+                                     'cpu': part_result.cpu,
+                                     'answer': part_result.answer,
+                                     'diagnostics': part_result.diagnostics,
+                                     'output': part_result.output,
+                                     'cached': part_result.cached,
+                                     'profile': part_result.profile}
+        # the startup stages, timed by registry.load and advent.puzzle
+        module_name = registry.get(package).module_name
+        for stage in STARTUP_STAGES:
+            timing = tm.last_timing(f"{module_name} {stage}")
+            result['startup'][stage] = timing.elapsed if timing is not None else None
+    except Exception:
+        result['error'] = traceback.format_exc()
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def run_scaled(package, size, backend='python'):
+    """generate an input of the given size for a day, and run it (this runs in a worker process)"""
+    try:
+        input_file = generate.write_input(package, size)
+    except Exception:
+        return {'day': package, 'input': None, 'size': size, 'parts': {},
+                'error': traceback.format_exc(), 'elapsed': 0}
+    result = run_day(package, input_file, advent.QUIET, backend=backend)
+    result['size'] = size
+    return result
+
+
+def answer_line(output):
+    """the last non-blank line printed by a part (the line with the answer in the golden files)"""
+    for line in reversed(output.splitlines()):
+        if line.strip():
+            return line.strip()
+    return ''
+
+
+def golden_answers(golden_file):
+    """get the answer line for each part from a golden output file"""
+    with open(golden_file) as golden:
+        text = golden.read()
+    # the output has a header, then part 1 and part 2, separated by lines of dashes
+    sections = text.split('\n' + '-'*80 + '\n')
+    answers = {}
+    for part, section in enumerate(sections[1:3], 1):
+        lines = section.split('\n')
+        # skip the part's description ('Part n - ' and its indented continuation lines)
+        i = 0
+        while i < len(lines) and not lines[i].strip():
+            i += 1
+        if i < len(lines) and lines[i].startswith(f"Part {part} -"):
+            i += 1
+            while i < len(lines) and lines[i].startswith(' '):
+                i += 1
+        answers[part] = answer_line('\n'.join(lines[i:]))
+    return answers
+
+
+def check_result(result):
+    """compare the answer lines printed in a result with the day's golden output file"""
+    golden = golden_answers(golden_file(result['input']))
+    for part, part_result in result['parts'].items():
+        expected = golden.get(part, '')
+        printed = answer_line(part_result['output'])
+        part_result['expected'] = expected
+        part_result['printed'] = printed
+        part_result['check'] = 'ok' if printed == expected else 'FAIL'
+
+
+def load_history(history_file):
+    """load the benchmark history (a list of runs)"""
+    if not os.path.isfile(history_file):
+        return []
+    with open(history_file) as history:
+        return json.load(history)
+
+
+def save_history(history_file, history, results):
+    """add the timings of this run to the benchmark history"""
+    run = {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'timings': {}}
+    for result in results:
+        if result['error']:
+            continue
+        run['timings'][result['input']] = {str(part): part_result['elapsed']
+                                           for part, part_result in result['parts'].items()
+                                           if not part_result['cached']}
+    history.append(run)
+    with open(history_file, 'w') as history_out:
+        json.dump(history, history_out, indent=1)
+
+
+def bench_result(result, history, threshold, runs=5, floor=0.005):
+    """compare the part timings in a result with the baselines from the history
+       the baseline is the median of the last few recorded runs.  Parts faster than
+       'floor' seconds are never marked slow (their timings are mostly noise)
+    """
+    for part, part_result in result['parts'].items():
+        if part_result['cached']:
+            continue
+        previous = [run['timings'][result['input']][str(part)] for run in history
+                    if result['input'] in run['timings']
+                    and run['timings'][result['input']].get(str(part)) is not None]
+        if not previous or part_result['elapsed'] is None:
+            part_result['bench'] = 'new'
+            continue
+        baseline = statistics.median(previous[-runs:])
+        part_result['baseline'] = baseline
+        ratio = part_result['elapsed'] / baseline if baseline else 1
+        slow = ratio > 1 + threshold and part_result['elapsed'] > floor
+        part_result['bench'] = f"{'SLOW' if slow else 'ok'} {ratio:4.2f}x"
+
+
+def failed(result):
+    """True if the day failed, gave a wrong answer or was too slow"""
+    if result['error']:
+        return True
+    for part_result in result['parts'].values():
+        if part_result.get('check') == 'FAIL' or part_result.get('bench', '').startswith('SLOW'):
+            return True
+        if part_result.get('blowup'):
+            return True
+    if result.get('over_budget'):
+        return True
+    return False
+
+
+def print_report(results, wall_time):
+    """print the timings and answers for all of the days"""
+    print()
+    print(f"{'input':24s} {'part':>4s} {'elapsed':>10s} {'cpu':>10s} {'check':>5s} {'bench':>10s}  answer")
+    print('-'*100)
+    total = 0
+    for result in results:
+        if result['error']:
+            print(f"{result['input'] or result['day']:24s} {'':>4s} {'FAILED':>10s}")
+            for line in result['error'].rstrip().splitlines():
+                print(f"         {line}")
+            continue
+        total += result['elapsed']
+        for part, part_result in result['parts'].items():
+            bench = part_result.get('bench', 'cached' if part_result['cached'] else '')
+            print(f"{result['input']:24s} {part:4d} {tm.format_seconds(part_result['elapsed']):>10s} "
+                  f"{tm.format_seconds(part_result['cpu']):>10s} {part_result.get('check', ''):>5s} "
+                  f"{bench:>10s}  {format_answer(part_result['answer'])}")
+            if part_result.get('check') == 'FAIL':
+                print(f"{'':24s} {'':4s} {'printed':>38s}  {part_result['printed']}")
+                print(f"{'':24s} {'':4s} {'expected':>38s}  {part_result['expected']}")
+    print('-'*100)
+    print(f"sum of day times {tm.format_seconds(total)},  wall time {tm.format_seconds(wall_time)}")
+    failures = [result['input'] or result['day'] for result in results if failed(result)]
+    if failures:
+        print(f"{len(failures)} failed: {', '.join(failures)}")
+
+
+# the startup stages of a day, in order (the TimingManager names are '<module name> <stage>',
+# except for the Harness, the import of advent.py, which is timed by cold_start)
+STARTUP_STAGES = ('Harness', 'Import', 'Input', 'Init')
+
+# run in a fresh interpreter by cold_start, prints the times to import advent and the day
+COLD_START = '''
+import sys, time
+start = time.perf_counter()
+import advent
+harness = time.perf_counter() - start
+import registry
+import TimingManager as tm
+day = registry.get(sys.argv[1])
+day.load()
+print(harness, tm.last_timing(day.module_name + ' Import').elapsed)
+'''
+
+
+def cold_start(package):
+    """the times to import advent.py and a day's module, in a fresh interpreter
+         returns (harness, import) in seconds
+    """
+    output = subprocess.run([sys.executable, '-c', COLD_START, package], capture_output=True,
+                            text=True, check=True).stdout
+    harness, day_import = output.split()
+    return float(harness), float(day_import)
+
+
+def startup_time(result):
+    """the total time of a run's startup stages"""
+    return sum(elapsed for elapsed in result['startup'].values() if elapsed is not None)
+
+
+def print_startup_report(results, budget):
+    """print the startup stages and the parts of each run, marking the runs over budget"""
+    print()
+    print(f"{'input':24s} {'harness':>10s} {'import':>10s} {'input':>10s} {'init':>10s} {'startup':>10s} "
+          f"{'part 1':>10s} {'part 2':>10s}")
+    print('-'*110)
+    for result in results:
+        if result['error']:
+            continue
+        # the imports, cold
+        result['startup']['Harness'], result['startup']['Import'] = cold_start(result['day'])
+        stages = [tm.format_seconds(result['startup'].get(stage)) for stage in STARTUP_STAGES]
+        parts = [tm.format_seconds(result['parts'][part]['elapsed']) if part in result['parts'] else ''
+                 for part in (1, 2)]
+        total = startup_time(result)
+        result['over_budget'] = total > budget
+        status = '  OVER BUDGET' if result['over_budget'] else ''
+        print(f"{result['input']:24s} {stages[0]:>10s} {stages[1]:>10s} {stages[2]:>10s} {stages[3]:>10s} "
+              f"{tm.format_seconds(total):>10s} {parts[0]:>10s} {parts[1]:>10s}{status}")
+    print('-'*110)
+    over = [result['input'] for result in results if result.get('over_budget')]
+    print(f"startup budget {tm.format_seconds(budget)}: {len(over)} over{': ' if over else ''}{', '.join(over)}")
+
+
+def print_hot_spots(results, count=3):
+    """print the functions with the most time of their own, for each part of each profiled day"""
+    print()
+    print(f"{'input':24s} {'part':>4s} {'own':>10s} {'calls':>9s}  hot spot")
+    print('-'*100)
+    for result in results:
+        for part, part_result in result['parts'].items():
+            if not part_result.get('profile'):
+                continue
+            functions = sorted(part_result['profile']['functions'], key=lambda function: function['tottime'], reverse=True)
+            name, number = result['input'], part
+            for function in functions[:count]:
+                print(f"{name:24s} {number:>4} {tm.format_seconds(function['tottime']):>10s} {function['calls']:9d}  {function['function']}")
+                name, number = '', ''
+    print('-'*100)
+
+
+def growth_exponent(results, part, floor=0.005):
+    """how the time of a part grows with the size: the exponent of time ~ size**exponent
+         computed from the smallest and largest sizes, only times above 'floor' seconds
+         are used (smaller times are mostly noise).  None if it cannot be computed
+    """
+    timed = [(result['size'], result['parts'][part]['elapsed']) for result in results
+             if not result['error'] and part in result['parts']
+             and result['parts'][part]['elapsed'] is not None and result['parts'][part]['elapsed'] > floor]
+    if len(timed) < 2 or timed[0][0] == timed[-1][0]:
+        return None
+    (size_0, time_0), (size_1, time_1) = timed[0], timed[-1]
+    return math.log(time_1 / time_0) / math.log(size_1 / size_0)
+
+
+def print_scale_report(results, max_exponent):
+    """print the timings of each day at each size, and the growth of each part's time"""
+    print()
+    print(f"{'day':8s} {'size':>8s} {'':16s} {'part 1':>10s} {'part 2':>10s}")
+    print('-'*100)
+    days = []
+    for result in results:
+        if result['day'] not in days:
+            days.append(result['day'])
+    for package in days:
+        day_results = [result for result in results if result['day'] == package]
+        for result in day_results:
+            if result['error']:
+                print(f"{package:8s} {result['size']:8d} {'':16s} {'FAILED':>10s}")
+                for line in result['error'].rstrip().splitlines():
+                    print(f"         {line}")
+                continue
+            times = [tm.format_seconds(result['parts'][part]['elapsed']) if part in result['parts'] else ''
+                     for part in (1, 2)]
+            print(f"{package:8s} {result['size']:8d} {generate.GENERATORS[package][2]:16s} {times[0]:>10s} {times[1]:>10s}")
+        # the growth of each part, a part that grows faster than max_exponent is marked
+        # on the result for the biggest size
+        growth = []
+        for part in (1, 2):
+            exponent = growth_exponent(day_results, part)
+            if exponent is None:
+                growth.append('-')
+                continue
+            growth.append(f"n^{exponent:.1f}")
+            if exponent > max_exponent:
+                growth[-1] += ' BLOWUP'
+                day_results[-1]['parts'][part]['blowup'] = True
+        print(f"{'':8s} {'growth':>8s} {'':16s} {growth[0]:>10s} {growth[1]:>10s}")
+    print('-'*100)
+    failures = [f"{result['day']} size {result['size']}" for result in results if failed(result)]
+    if failures:
+        print(f"{len(failures)} failed: {', '.join(failures)}")
+
+
+def scale_days(days=None, factors=(0.5, 1, 2), workers=None, backend='python', max_exponent=3):
+    """run the days with generated inputs of several sizes, and report how their times grow"""
+    if days is None:
+        days = find_days()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # build the list of (day, size) runs
+    runs = []
+    for package in days:
+        if package not in generate.GENERATORS or generate.GENERATORS[package][1] is None:
+            print(f"{package}: the input has a fixed size, it is not scaled")
+            continue
+        real_size = generate.GENERATORS[package][1]
+        sizes = sorted(set(max(1, round(real_size * factor)) for factor in factors))
+        runs += [(package, size) for size in sizes]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_scaled, package, size, backend) for package, size in runs]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['day'], result['size']] = result
+            status = 'FAILED' if result['error'] else tm.format_seconds(result['elapsed'])
+            print(f"{result['day']:8s} size {result['size']:<8d} done  {status}")
+
+    results = [results[run] for run in runs]
+    print_scale_report(results, max_exponent)
+    return results
+
+
+def format_answer(answer):
+    """format an answer for the report, multi-line answers (Day13) continue on the following lines"""
+    if answer is None:
+        return ''
+    return str(answer).replace('\n', '\n' + ' '*68)
+
+
+def test_all(input_name='input.txt', days=None, workers=None, check=False,
+             bench=False, threshold=0.25, history_file='bench_history.json', verbose=False, cache=False,
+             backend='python', profile=0, startup_budget=None):
+    """run all of the days (or just those listed) in a pool of worker processes"""
+    if days is None:
+        days = find_days()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # build the list of (day, input file) runs
+    runs = []
+    for package in days:
+        if check:
+            runs += [(package, input_file) for input_file in find_checked_inputs(package)]
+        else:
+            input_file = find_input(package, input_name)
+            if input_file is None:
+                print(f"{package}: no {input_name} or sample.txt")
+                continue
+            runs.append((package, input_file))
+
+    verbosity = advent.VERBOSE if check or verbose else advent.QUIET
+
+    start = time.perf_counter()
+    results = {}
+    # each run gets a fresh worker process, some days keep state in classes
+    # (counters, caches) that would otherwise leak from one run into the next
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_day, package, input_file, verbosity, cache, backend, profile)
+                   for package, input_file in runs]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['input']] = result
+            status = 'FAILED' if result['error'] else tm.format_seconds(result['elapsed'])
+            if not result['error'] and all(part['cached'] for part in result['parts'].values()):
+                status += '  (cached)'
+            print(f"{result['input']:24s} done  {status}")
+    wall_time = time.perf_counter() - start
+
+    # report the runs in day order, not completion order
+    results = [results[input_file] for _, input_file in runs]
+
+    if check:
+        for result in results:
+            if not result['error']:
+                check_result(result)
+    if bench:
+        history = load_history(history_file)
+        for result in results:
+            if not result['error']:
+                bench_result(result, history, threshold)
+        save_history(history_file, history, results)
+
+    print_report(results, wall_time)
+    if startup_budget is not None:
+        print_startup_report(results, startup_budget)
+    if profile:
+        print_hot_spots(results)
+    return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='run the Advent of Code 2021 puzzles')
+    parser.add_argument('days', nargs='*', help='days to run (e.g. Day1 Day15), default is all days')
+    parser.add_argument('-i', '--input', default='input.txt', help='input file name in each day (default input.txt)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes (default: number of cores)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='render the grids, paths, etc. (slower)')
+    parser.add_argument('--check', action='store_true', help='compare the answers with the golden results files')
+    parser.add_argument('--bench', action='store_true', help='compare the timings with bench_history.json and record them')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown for --bench (default 0.25 = 25%%)')
+    parser.add_argument('--history', default='bench_history.json', help='benchmark history file (default bench_history.json)')
+    parser.add_argument('--cache', action='store_true', help='reuse the cached answers of days whose input and source are unchanged')
+    parser.add_argument('--numpy', action='store_const', const='numpy', default='python', dest='backend',
+                        help='use the NumPy versions of the grid days')
+    parser.add_argument('--profile', type=int, nargs='?', const=advent.PROFILE_TOP, default=0, metavar='N',
+                        help=f'profile each part, keep the top N functions and allocation sites (default {advent.PROFILE_TOP})')
+    parser.add_argument('--startup', type=float, nargs='?', const=100, default=None, metavar='MS',
+                        help='report the import, input and constructor times, budget in ms (default 100)')
+    parser.add_argument('--scale', type=float, nargs='*', default=None, metavar='FACTOR',
+                        help='run generated inputs scaled by these factors (default 0.5 1 2), list the days first')
+    parser.add_argument('--max-exponent', type=float, default=3, help='allowed growth exponent for --scale (default 3)')
+    return parser.parse_args(argv)
+
 
-mod_list = []
-
-# each imported advent module will add itself to mod_list
-import Day1.advent_puzzle
-
-
-def test_all(input_file):
-    
-    # test all the modules imported above
-    for mod, pack in mod_list:
-        mod_name = mod.__name__
-        # print(f'\nTesting {mod_name}  -  {mod.description}')
-        print(f'\nTesting {mod_name}')
-        # use TimingManager to get elapsed time for each part
-        with tm.TimingManager(f'{mod_name} Part1', elapsedOnly=True):
-            mod.puzzle(pack+'/'+input_file, part=1)
-            
-        with tm.TimingManager(f'{mod_name} Part2', elapsedOnly=True):
-            mod.puzzle(pack+'/'+input_file, part=2)
-    
 if __name__ == '__main__':
-    test_all('input.txt')
+    # the days' paths are relative to the folder containing test_all.py
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    args = parse_args(sys.argv[1:])
+    if args.profile and args.bench:
+        sys.exit("--profile and --bench cannot be used together (the profiler slows the days down)")
+    if args.scale is not None:
+        results = scale_days(args.days or None, args.scale or (0.5, 1, 2), workers=args.workers,
+                             backend=args.backend, max_exponent=args.max_exponent)
+        sys.exit(1 if any(failed(result) for result in results) else 0)
+    results = test_all(args.input, days=args.days or None, workers=args.workers, check=args.check,
+                       bench=args.bench, threshold=args.threshold, history_file=args.history,
+                       verbose=args.verbose, cache=args.cache, backend=args.backend, profile=args.profile,
+                       startup_budget=None if args.startup is None else args.startup / 1000)
+    if any(failed(result) for result in results):
+        sys.exit(1)